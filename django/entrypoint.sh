@@ -33,4 +33,14 @@ until python manage.py check; do
     sleep 1
 done
 
+# Workers de parties supplémentaires : le worker N écoute sur 8000 + N,
+# nginx y envoie /ws/game/<game_id>/ selon le dernier chiffre du game_id
+WORKERS=${PONG_GAME_WORKERS:-1}
+i=1
+while [ "$i" -lt "$WORKERS" ]; do
+    echo "Starting game worker $i on port $((8000 + i))..."
+    PONG_WORKER_INDEX=$i daphne --proxy-headers -b 0.0.0.0 -p $((8000 + i)) pong.asgi:application &
+    i=$((i + 1))
+done
+
 exec daphne --proxy-headers -b 0.0.0.0 -p 8000 pong.asgi:application
@@ -4,9 +4,9 @@ from urllib.parse import parse_qs
 from jwt import decode as jwt_decode
 from django.conf import settings
 from .logic.game import *
-from .logic.ai_player import launch_ai
+from .logic import wire
 import json
-from .logic.lobby import Lobby
+from .logic.lobby import Lobby, AI_FULL_MESSAGE
 import uuid
 import asyncio
 from channels.db import database_sync_to_async
@@ -16,46 +16,18 @@ from datetime import datetime
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import time
-from .urls import INVITATIONS
 
 
 class ChatConsumer(AsyncWebsocketConsumer):
 
     room_group_name = None
 
-    async def start_cleanup_task(self):
-        while True:
-            expired_keys = []
-            now = time.time()
-            #invitations en cours
-            for key, inv in list(INVITATIONS.items()):
-                if inv["expires_at"] < now:
-                    expired_keys.append(key)
-
-            for key in expired_keys:
-                invitation = INVITATIONS.pop(key, None)
-                if invitation is None:
-                    continue
-
-                from_id = invitation["from_id"]
-                to_id = invitation["to_id"]
-
-                await self.channel_layer.group_send(
-                    f"user_{from_id}",
-                    {
-                        "type": "invitation_expired",
-                        "invite_id": key,
-                    }
-                )
-                await self.channel_layer.group_send(
-                    f"user_{to_id}",
-                    {
-                        "type": "invitation_expired",
-                        "invite_id": key,
-                    }
-                )
-
-            await asyncio.sleep(1)
+    # L'invité a ouvert la partie : l'invitation n'expirera plus
+    async def accept_invitation(self, invite_id):
+        invitations = Lobby.get_instance().invitations
+        invitation = invitations.get(invite_id)
+        if invitation is not None and invitation["to_id"] == self.user_id:
+            invitations.cancel(invite_id)
 
     async def invitation_expired(self, event):
         invite_id = event["invite_id"]
@@ -73,7 +45,6 @@ class ChatConsumer(AsyncWebsocketConsumer):
             return
 
         self.user_id = self.user.id
-        await self.set_user_online_state(self.user_id, True)
 
         self.username = self.user.username or "Anonyme"
 
@@ -81,8 +52,6 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         await self.accept()
 
-        asyncio.create_task(self.start_cleanup_task())
-
         blocked_users = await self.get_blocked_users()
         await self.send(json.dumps({
             "type": "user_list",
@@ -97,10 +66,18 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         await self.channel_layer.group_add(self.personal_group, self.channel_name)
 
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {"type": "broadcast_user_list"}
-        )
+        # Liste complète pour cette connexion, simple delta pour les autres
+        presence = Lobby.get_instance().presence
+        came_online = presence.connect(self.user_id, self.username)
+        await self.send(json.dumps({
+            "type": "user_list",
+            "users": presence.snapshot(),
+        }))
+        if came_online:
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {"type": "user_online", "username": self.username}
+            )
 
         await self.send(json.dumps({
             "type": "welcome",
@@ -109,18 +86,16 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
 
-        if self.user.is_authenticated:
-            await self.set_user_online_state(self.user_id, False)
-
         if hasattr(self, "room_group_name") and self.room_group_name:
             await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
 
         if hasattr(self, "personal_group"):
             await self.channel_layer.group_discard(self.personal_group, self.channel_name)
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {"type": "broadcast_user_list"}
-        )
+            if Lobby.get_instance().presence.disconnect(self.user_id):
+                await self.channel_layer.group_send(
+                    self.room_group_name,
+                    {"type": "user_offline", "username": self.username}
+                )
 
     async def receive(self, text_data):
         try:
@@ -205,20 +180,6 @@ class ChatConsumer(AsyncWebsocketConsumer):
     def get_blocked_users(self):
         return list(self.user.blocked_users.values("username"))
 
-    @database_sync_to_async
-    def set_user_online_state(self, user_id, state: bool):
-        try:
-            user_obj = CustomUser.objects.get(id=user_id)
-            user_obj.online_status = state
-            user_obj.save()
-        except CustomUser.DoesNotExist:
-            print(f"[set_user_online_state] Introuvable pour user_id={user_id}")
-
-    @database_sync_to_async
-    def get_online_users(self):
-        queryset = CustomUser.objects.filter(online_status=True).values("username")
-        return list(queryset)
-
     @database_sync_to_async
     def reset_in_game_state(self):
         self.user.in_game = False
@@ -305,11 +266,16 @@ class ChatConsumer(AsyncWebsocketConsumer):
         self.blocked_users_ids = await self.get_blocked_users_ids()
         await self.send(json.dumps({"type": "system", "message": f"Vous avez débloqué {unblocked_user.username}"}))
 
-    async def broadcast_user_list(self, event):
-        online_users = await self.get_online_users()
+    async def user_online(self, event):
         await self.send(json.dumps({
-            "type": "user_list",
-            "users": online_users,
+            "type": "user_online",
+            "username": event["username"]
+        }))
+
+    async def user_offline(self, event):
+        await self.send(json.dumps({
+            "type": "user_offline",
+            "username": event["username"]
         }))
 
     async def system(self, event):
@@ -340,7 +306,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         lobby_instance = Lobby.get_instance()
         game_id = await lobby_instance.API_start_game_async(self.scope["user"].username, target_username)
 
-        if game_id not in lobby_instance.active_games:
+        if not lobby_instance.game_exists(game_id):
             await self.send(json.dumps({
                 "type": "error",
                 "message": "Erreur lors de la création de la partie."
@@ -349,14 +315,14 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
         invite_id = str(uuid.uuid4())
         expiration = time.time() + 30
-        INVITATIONS[invite_id] = {
+        lobby_instance.invitations.add(invite_id, {
             "from": self.user.username,
             "from_id": self.user.id,
             "to": target_username,
             "to_id": target_user.id,
             "game_id": game_id,
             "expires_at": expiration
-        }
+        })
 
         # send to the group dest
         target_group = f"user_{target_user.id}"
@@ -415,6 +381,12 @@ class LobbyConsumer(AsyncWebsocketConsumer):
     async def handle_find_game(self, mode):
         if mode == 'solo':
             game_id, player1 = await self.lobby.create_solo_game(self)
+            if game_id is None:
+                await player1.send(json.dumps({
+                    "type": "waiting",
+                    "message": AI_FULL_MESSAGE
+                }))
+                return
             await player1.send(json.dumps({
                 "type": "game_found",
                 "game_id": game_id,
@@ -452,8 +424,12 @@ class PongConsumer(AsyncWebsocketConsumer):
         self.game_id = self.scope['url_route']['kwargs']['game_id']
         self.lobby = Lobby.get_instance()
 
-        self.game = self.lobby.get_game(self.game_id)
+        self.game = await self.lobby.get_or_load_game(self.game_id)
         if not self.game:
+            refusal = self.lobby.refused.pop(self.game_id, None)
+            if refusal is not None:
+                await self.accept()
+                await self.send(json.dumps({"type": "waiting", "message": refusal}))
             await self.close()
             return
 
@@ -463,11 +439,15 @@ class PongConsumer(AsyncWebsocketConsumer):
             self.player_id = "player1"
 
         self.is_ai = query_params.get('mode', ['human'])[0] == 'solo' and self.player_id == 'player2'
+        self.binary = query_params.get('proto', ['json'])[0] == 'bin'
 
         if not self.player_id or self.player_id not in ["player1", "player2"] and not self.player_id == 'local':
             await self.close()
             return
 
+        # Compté avant l'abonnement : chaque trame reçue porte son encodage
+        self.game.add_receiver(self.binary)
+        self.receiver_registered = True
         await self.channel_layer.group_add(self.game_id, self.channel_name)
         await self.accept()
         self.game.set_player_connected(self.player_id)
@@ -476,6 +456,8 @@ class PongConsumer(AsyncWebsocketConsumer):
         await self.channel_layer.group_discard(self.game_id, self.channel_name)
         player = getattr(self, "player_id", "unknown")
         if self.game:
+            if getattr(self, "receiver_registered", False):
+                self.game.remove_receiver(self.binary)
             if hasattr(self, "player_id"):
                 self.game.handle_player_disconnect(self.player_id)
             else:
@@ -483,11 +465,15 @@ class PongConsumer(AsyncWebsocketConsumer):
             if self.game.game_over:
                 Lobby.get_instance().remove_game(self.game_id)
 
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         try:
-            data = json.loads(text_data)
-            action = data.get('action')
-            player_identifier = data.get('player', self.player_id)
+            if bytes_data is not None:
+                action, player = wire.decode_action(bytes_data)
+                player_identifier = player or self.player_id
+            else:
+                data = json.loads(text_data)
+                action = data.get('action')
+                player_identifier = data.get('player', self.player_id)
 
             if not action:
                 return
@@ -497,9 +483,12 @@ class PongConsumer(AsyncWebsocketConsumer):
             print(f"[PongConsumer] Erreur lors de la réception d'un message : {e}")
 
     async def game_update(self, event):
-        if event["message"]["type"] == "game_over" and not self.is_ai:
-            await self.update_stats(event["message"]['message'])
-        await self.send(json.dumps(event["message"]))
+        if event["message_type"] == "game_over" and not self.is_ai:
+            await self.update_stats(json.loads(event["text"])['message'])
+        if self.binary and "bytes" in event:
+            await self.send(bytes_data=event["bytes"])
+        else:
+            await self.send(event["text"])
 
     async def update_stats(self, go_message):
         db_user = self.scope["user"]
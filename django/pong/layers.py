@@ -0,0 +1,198 @@
+import asyncio
+import base64
+import glob
+import json
+import os
+import random
+import string
+import struct
+import uuid
+from channels.exceptions import ChannelFull
+from channels.layers import InMemoryChannelLayer
+
+HEADER = struct.Struct("!I")
+# Au-delà, on attend que le pair ait lu avant d'écrire à nouveau
+WRITE_BUFFER_LIMIT = 1 << 20
+
+
+def encode(message):
+    return json.dumps(message, default=encode_bytes).encode()
+
+
+def encode_bytes(value):
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode()}
+    raise TypeError(f"{type(value).__name__} non sérialisable")
+
+
+def decode_bytes(obj):
+    if len(obj) == 1 and "__bytes__" in obj:
+        return base64.b64decode(obj["__bytes__"])
+    return obj
+
+
+# Couche de channels pour plusieurs processus d'une même machine, sans service
+# externe. Chaque processus (nœud) garde ses files et ses groupes en mémoire,
+# avec la capacité et l'expiration d'InMemoryChannelLayer, et écoute sur une
+# socket Unix dans `path`. Les nœuds s'annoncent les groupes où ils ont des
+# membres : un group_send n'est relayé qu'aux nœuds concernés, et un send()
+# vers un channel d'un autre nœud (son nom contient le nœud) lui est relayé.
+class UnixSocketChannelLayer(InMemoryChannelLayer):
+    def __init__(self, path="/tmp/pong-channels", **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.node = uuid.uuid4().hex[:12]
+        self.server = None
+        self.starting = None
+        self.peers = {}
+        self.handlers = {}
+        self.remote_groups = {}
+        self.relayed = 0
+        self.dropped = 0
+
+    def socket_path(self, node):
+        return os.path.join(self.path, f"{node}.sock")
+
+    async def start(self):
+        if self.starting is None:
+            self.starting = asyncio.ensure_future(self.listen())
+        await self.starting
+
+    async def listen(self):
+        os.makedirs(self.path, exist_ok=True)
+        self.server = await asyncio.start_unix_server(self.handle_peer, path=self.socket_path(self.node))
+        for path in glob.glob(os.path.join(self.path, "*.sock")):
+            node = os.path.basename(path)[:-len(".sock")]
+            if node != self.node:
+                await self.connect_peer(node)
+
+    async def connect_peer(self, node):
+        try:
+            _, writer = await asyncio.open_unix_connection(self.socket_path(node))
+        except OSError:
+            # Socket d'un processus arrêté
+            try:
+                os.unlink(self.socket_path(node))
+            except OSError:
+                pass
+            return
+        self.peers[node] = writer
+        await self.post([node], {"op": "hello", "node": self.node, "groups": list(self.groups)})
+
+    def drop_peer(self, node):
+        writer = self.peers.pop(node, None)
+        if writer is not None:
+            writer.close()
+        for nodes in self.remote_groups.values():
+            nodes.discard(node)
+
+    async def post(self, nodes, op):
+        data = encode(op)
+        frame = HEADER.pack(len(data)) + data
+        for node in nodes:
+            writer = self.peers.get(node)
+            if writer is None:
+                continue
+            if writer.is_closing():
+                self.drop_peer(node)
+                continue
+            writer.write(frame)
+            self.relayed += 1
+            if writer.transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    self.drop_peer(node)
+
+    async def handle_peer(self, reader, writer):
+        node = None
+        self.handlers[asyncio.current_task()] = writer
+        try:
+            while True:
+                size, = HEADER.unpack(await reader.readexactly(HEADER.size))
+                op = json.loads(await reader.readexactly(size), object_hook=decode_bytes)
+                kind = op["op"]
+                if kind == "hello":
+                    node = op["node"]
+                    for group in op["groups"]:
+                        self.remote_groups.setdefault(group, set()).add(node)
+                    if node not in self.peers:
+                        await self.connect_peer(node)
+                elif kind == "join":
+                    self.remote_groups.setdefault(op["group"], set()).add(node)
+                elif kind == "leave":
+                    self.remote_groups.get(op["group"], set()).discard(node)
+                elif kind == "send":
+                    try:
+                        await InMemoryChannelLayer.send(self, op["channel"], op["message"])
+                    except ChannelFull:
+                        self.dropped += 1
+                elif kind == "group_send":
+                    await InMemoryChannelLayer.group_send(self, op["group"], op["message"])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.handlers.pop(asyncio.current_task(), None)
+            writer.close()
+            if node is not None:
+                self.drop_peer(node)
+
+    def channel_node(self, channel):
+        if "!" not in channel:
+            return self.node
+        return channel.split("!", 1)[0].rsplit(".", 1)[-1]
+
+    # Channel layer API
+
+    async def new_channel(self, prefix="specific."):
+        await self.start()
+        return "%s.%s!%s" % (
+            prefix,
+            self.node,
+            "".join(random.choice(string.ascii_letters) for i in range(12)),
+        )
+
+    async def send(self, channel, message):
+        await self.start()
+        node = self.channel_node(channel)
+        if node == self.node or node not in self.peers:
+            await super().send(channel, message)
+            return
+        assert isinstance(message, dict), "message is not a dict"
+        self.require_valid_channel_name(channel)
+        await self.post([node], {"op": "send", "channel": channel, "message": message})
+
+    async def group_add(self, group, channel):
+        await self.start()
+        joined = group not in self.groups
+        await super().group_add(group, channel)
+        if joined:
+            await self.post(list(self.peers), {"op": "join", "group": group})
+
+    async def group_discard(self, group, channel):
+        await self.start()
+        await super().group_discard(group, channel)
+        if group not in self.groups:
+            await self.post(list(self.peers), {"op": "leave", "group": group})
+
+    async def group_send(self, group, message):
+        await self.start()
+        await super().group_send(group, message)
+        nodes = self.remote_groups.get(group)
+        if nodes:
+            await self.post(list(nodes), {"op": "group_send", "group": group, "message": message})
+
+    async def close(self):
+        for node in list(self.peers):
+            self.drop_peer(node)
+        for writer in self.handlers.values():
+            writer.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+            try:
+                os.unlink(self.socket_path(self.node))
+            except OSError:
+                pass
+        self.starting = None
@@ -1,167 +1,68 @@
-import asyncio
-import websockets
-import json
-from .game import CANVAS_HEIGHT, CANVAS_WIDTH, PADDLE_SIZE, PADDLE_WIDTH, DEFAULT_PLAYER_TWO_STATE, BALL_RADIUS, PLAYER_SPEED, absadd
-
-
+from .constants import CANVAS_WIDTH, PADDLE_SIZE, PLAYER_SPEED, BASE_TICK_RATE
+from .prediction import predict
+
+# L'IA ne relit la partie qu'une fois par seconde (plus une frame), en frames à 60 Hz
+DECISION_FRAMES = 61
+
+
+# Sens du déplacement vers target_y : la raquette ne bouge que si la balle est
+# attendue hors de sa hauteur, et vise alors à centrer la balle
+def plan(target_y, paddle_y):
+    if target_y < paddle_y:
+        return -1
+    if target_y > paddle_y + PADDLE_SIZE:
+        return 1
+    return 0
+
+
+# IA jouée dans le processus de la partie (Game.controllers) : appelée à chaque
+# tick avec la partie, elle renvoie la vitesse de sa raquette quand elle
+# change, sans timer ni coroutine. Une fois par seconde elle calcule où la
+# balle franchira sa ligne (prediction.predict) ; entre deux décisions elle se
+# déplace jusqu'à ce que le centre de la raquette atteigne ce point. Avec un
+# AIPool, le calcul est confié au pool et la cible arrive au tick qui suit sa
+# réponse.
 class AIPlayer:
     instance_count = 0
 
-    def __init__(self, host, game_id):
-        self.ws = f"ws://web:8000/ws/game/{game_id}/?player_id=player2"
+    def __init__(self, player_id="player2"):
+        self.player_id = player_id
         AIPlayer.instance_count += 1
-        self.ball_position = {'x': 0, 'y': 0, 'dx': 0, 'dy': 0}
-        self.paddle_position = {'x': 0, 'y': 0, 'speed': PLAYER_SPEED}
-        self.opponent_position = {'x': 0, 'y': 0}
-        self.paddle_size = PADDLE_SIZE
-        self.running = True
-        self.latest_message = None
-        self.next_estimation = {'x': 0, 'y':0, 'fbi':0}
-        self.lock = asyncio.Lock()
-
-    async def connect(self):
-        try:
-            async with websockets.connect(self.ws) as websocket:
-                self.websocket = websocket
-                listener_task = asyncio.create_task(self.listen(websocket))
-                processer_task = asyncio.create_task(self.process())
-                done, pending = await asyncio.wait(
-                    [listener_task, processer_task],
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-
-                if listener_task in done:
-                    self.running = False
-                elif processer_task in done:
-                    print("Le traitement a terminé en premier, arrêt de l'IA.", flush=True)
-
-                for task in pending:
-                    task.cancel()
-        except websockets.ConnectionClosed as e:
-            print(f"Connexion fermée : {e}", flush=True)
-        except Exception as e:
-            print(f"Erreur dans la connexion : {e}", flush=True)
-        finally:
-            self.running = False
-
-    async def listen(self, websocket):
-        try:
-            async for message in websocket:
-                data = json.loads(message)
-
-                if data.get("type") == "game_over":
-                    self.running = False
-                    break
-                elif data.get("type") == "position_update":
-                    self.latest_message = data
-
-        except asyncio.CancelledError:
-            print("Réception annulée.", flush=True)
-        except Exception as e:
-            print(f"Erreur dans receive_data : {e}", flush=True)
-
-
-    async def process(self):
-        while self.running:
-            message = None
-            time_to_sleep = 0
-            if self.latest_message is not None:
-                message = self.latest_message.copy()
-                self.latest_message = None
-            if message is not None:
-                self.update_positions(message)
-
-                time_to_sleep = await self.define_and_send(self.websocket)
-            await asyncio.sleep((time_to_sleep + 1)/ 60)
-
-
-    def actualise_pos(self, pos):
-        pos['x'] += pos['dx']
-        if (pos['x'] - BALL_RADIUS <= PADDLE_WIDTH + (CANVAS_WIDTH // 100)):
-            pos['x'] += (PADDLE_WIDTH + (CANVAS_WIDTH // 100)) - (pos['x'] - BALL_RADIUS)
-            pos['dy'] = 0
-            pos['dx'] = absadd(pos['dx'], 1)
-            pos['dx'] *= -1
-        pos['y'] += pos['dy']
-        if (pos['y'] + BALL_RADIUS > CANVAS_HEIGHT):
-            pos['y'] -= (pos['y'] + BALL_RADIUS) - CANVAS_HEIGHT
-            pos['dy'] *= -1
-        elif (pos['y'] - BALL_RADIUS < 0):
-            pos['y'] += 0 - (pos['y'] - BALL_RADIUS)
-            pos['dy'] *= -1
-        return {'x': pos['x'], 'y': pos['y'], 'dx': pos['dx'], 'dy': pos['dy']}
-
-
-    def update_positions(self, data):
-        self.ball_position.update(data["ball_position"])
-        self.paddle_position.update(data["player2_state"])
-        self.opponent_position.update(data["player1_state"])
-
-
-    def estimate_next_point(self):
-        act_pos = {'x': self.ball_position['x'], 'y': self.ball_position['y'], 'dx': self.ball_position['dx'], 'dy': self.ball_position['dy']}
-        for frames in range(60):
-            act_pos = self.actualise_pos(act_pos)
-            if act_pos['x'] + BALL_RADIUS >= DEFAULT_PLAYER_TWO_STATE['x']:
-                self.next_estimation['fbi'] = frames
-                self.next_estimation['x'] = act_pos['x']
-                self.next_estimation['y'] = act_pos['y']
-                return
-            if frames >= 59 or act_pos['x'] - BALL_RADIUS <= (CANVAS_WIDTH // 100 ) + PADDLE_WIDTH:
-                self.next_estimation['fbi'] = frames
-                self.next_estimation['x'] = act_pos['x']
-                self.next_estimation['y'] = CANVAS_HEIGHT // 2
-                return
-
-
-    async def compute_action(self, websocket):
-        paddle_y = self.paddle_position["y"]
-        action = []
-
-        ball_y = self.next_estimation["y"]
-
-        if ball_y < paddle_y:
-            action.append("move_up")
-            diff = (paddle_y + (PADDLE_SIZE // 2)) - ball_y
-        elif ball_y > paddle_y + self.paddle_size:
-            action.append("move_down")
-            diff = ball_y - (paddle_y + (PADDLE_SIZE // 2))
-        else:
-            action.append(None)
-        if action[0] is not None:
-            frames_to_reach = int(diff // PLAYER_SPEED) + 1
-            action.append(min(frames_to_reach, 59))
-            action.append(f"stop_{action[0]}")
-        return action
-
-
-    async def define_and_send(self, websocket):
-        self.estimate_next_point()
-        actions = await self.compute_action(websocket)
-        if actions:
-            i = 0
-            total_wait = 0
-            while i < len(actions):
-                if isinstance(actions[i], int):
-                    await asyncio.sleep((actions[i])/ 60)
-                    total_wait += actions[i]
-                    i += 1
-                elif actions is None:
-                    continue
-                else:
-                    await websocket.send(json.dumps({"action": actions[i]}))
-                    i += 1
-            if total_wait < 60:
-                return 60 - total_wait
+        self.next_decision = 0
+        self.target = None
+        self.direction = 0
+        self.planned = None
+        self.pool = None
+
+    def __call__(self, game):
+        paddle = game.players[self.player_id]
+        paddle_y = paddle.y
+        if self.planned is not None:
+            self.aim(self.planned, paddle_y)
+            self.planned = None
+        if game.tick >= self.next_decision:
+            self.next_decision = game.tick + max(1, round(DECISION_FRAMES * game.tick_rate / BASE_TICK_RATE))
+            snapshot = self.snapshot(game)
+            if self.pool is not None:
+                self.pool.submit(self, snapshot)
             else:
-                return 0
-
-
-if __name__ == "__main__":
-    ai = AIPlayer()
-    asyncio.run(ai.connect())
-
-
-async def launch_ai(host, game_id):
-    ai = AIPlayer(host, game_id)
-    await ai.connect()
+                self.aim(self.decide(snapshot), paddle_y)
+
+        if self.direction and (self.target - (paddle_y + PADDLE_SIZE // 2)) * self.direction <= 0:
+            self.direction = 0
+        velocity = self.direction * PLAYER_SPEED
+        return None if velocity == paddle.dy else velocity
+
+    def aim(self, target, paddle_y):
+        self.target = target
+        self.direction = plan(target, paddle_y)
+
+    # Le terrain est symétrique : pour le joueur 1, la balle est vue en miroir
+    def snapshot(self, game):
+        ball = game.ball_state
+        if self.player_id == "player1":
+            return CANVAS_WIDTH - ball.x, ball.y, -ball.dx, ball.dy
+        return ball.x, ball.y, ball.dx, ball.dy
+
+    def decide(self, snapshot):
+        return predict(*snapshot)[2]
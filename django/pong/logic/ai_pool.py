@@ -0,0 +1,105 @@
+import asyncio
+import multiprocessing
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .prediction import predict_batch
+
+# Latences de décision gardées pour les statistiques
+LATENCY_WINDOW = 1000
+
+
+# Cibles d'un lot de bots, calculées dans le processus de l'AIPool :
+# snapshots (x, y, dx, dy de la balle) -> y de franchissement de leur ligne
+def decide_batch(snapshots):
+    _, _, targets = predict_batch(*zip(*snapshots))
+    return targets.tolist()
+
+
+# Tier d'exécution des IA, à l'écart de la boucle asyncio qui sert les
+# WebSocket : les bots déposent un snapshot au moment de décider, la GameLoop
+# envoie à chaque frame les snapshots en attente en un seul lot au processus
+# de calcul, et chaque bot reçoit sa cible au tick qui suit la réponse. Un
+# seul lot est en vol à la fois, les snapshots suivants attendent le prochain.
+# Le nombre de bots est plafonné par processus.
+#
+# Les processus sont lancés par spawn : ils n'importent que ce module,
+# prediction et constants, sans Django ni l'état du processus de jeu (boucle
+# asyncio, connexions). workers=0 calcule les décisions dans la boucle.
+class AIPool:
+    def __init__(self, workers=1, max_bots=200):
+        self.executor = None
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self.max_bots = max_bots
+        self.bots = set()
+        self.requests = []
+        self.in_flight = False
+        self.decisions = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def full(self):
+        return len(self.bots) >= self.max_bots
+
+    def register(self, bot):
+        self.bots.add(bot)
+        bot.pool = self
+
+    def release(self, bot):
+        self.bots.discard(bot)
+        bot.pool = None
+
+    def submit(self, bot, snapshot):
+        self.requests.append((bot, snapshot, time.perf_counter()))
+
+    def flush(self):
+        if not self.requests or self.in_flight:
+            return
+        requests, self.requests = self.requests, []
+        if self.executor is None:
+            self.deliver(requests, decide_batch([snapshot for _, snapshot, _ in requests]))
+            return
+        self.in_flight = True
+        asyncio.get_running_loop().create_task(self.run_batch(requests))
+
+    async def run_batch(self, requests):
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, decide_batch, [snapshot for _, snapshot, _ in requests]
+            )
+        except Exception as e:
+            print(f"[AIPool] Erreur : {e}", flush=True)
+            self.errors += 1
+            results = [None] * len(requests)
+        finally:
+            self.in_flight = False
+        self.deliver(requests, results)
+
+    def deliver(self, requests, results):
+        now = time.perf_counter()
+        for (bot, _, submitted), target in zip(requests, results):
+            if target is not None:
+                bot.planned = target
+            self.latencies.append(now - submitted)
+        self.decisions += len(requests)
+        self.batches += 1
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            "bots": len(self.bots),
+            "decisions": self.decisions,
+            "batches": self.batches,
+            "mean_batch": self.decisions / self.batches if self.batches else 0.0,
+            "errors": self.errors,
+            "latency_p50": statistics.median(latencies) if latencies else 0.0,
+            "latency_p99": latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+        }
@@ -0,0 +1,33 @@
+# Dimensions du terrain et vitesses, sans dépendance à Django : importées par
+# game.py et par les modules chargés dans les processus de l'AIPool
+PADDLE_SIZE = 70
+PADDLE_WIDTH = 10
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 400
+BALL_RADIUS = 5
+# Les vitesses (dx, dy, PLAYER_SPEED) sont exprimées en pixels par frame à 60 Hz
+BASE_TICK_RATE = 60
+UPDATE_INTERVAL = 1 / BASE_TICK_RATE
+PLAYER_SPEED = 8
+
+DEFAULT_PLAYER_ONE_STATE = {
+    'x': CANVAS_WIDTH / 100,
+    'y': (CANVAS_HEIGHT / 2) - (PADDLE_SIZE / 2),
+    'dy': 0,
+    'speed': PLAYER_SPEED,
+}
+
+DEFAULT_PLAYER_TWO_STATE = {
+    'x': CANVAS_WIDTH - (CANVAS_WIDTH / 100) - PADDLE_WIDTH,
+    'y': (CANVAS_HEIGHT / 2) - (PADDLE_SIZE / 2),
+    'dy': 0,
+    'speed': PLAYER_SPEED,
+}
+
+DEFAULT_BALL_STATE = {
+    'x': CANVAS_WIDTH / 2,
+    'y': CANVAS_HEIGHT / 2,
+    'dx': 5,
+    'dy': 5,
+    'radius': BALL_RADIUS,
+}
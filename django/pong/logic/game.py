@@ -4,68 +4,63 @@ import math
 import random
 from channels.layers import get_channel_layer
 from channels.db import database_sync_to_async
-from ..models import SimpleMatch, CustomUser
+from django.conf import settings
+from ..models import SimpleMatch, CustomUser, TournamentMatch
+from . import wire
+from .state import PaddleState, BallState
+from .constants import (
+    PADDLE_SIZE, PADDLE_WIDTH, CANVAS_WIDTH, CANVAS_HEIGHT, BALL_RADIUS,
+    BASE_TICK_RATE, UPDATE_INTERVAL, PLAYER_SPEED,
+    DEFAULT_PLAYER_ONE_STATE, DEFAULT_PLAYER_TWO_STATE, DEFAULT_BALL_STATE,
+)
 import json
 
-# Constantes
-PADDLE_SIZE = 70
-PADDLE_WIDTH = 10
-CANVAS_WIDTH = 800
-CANVAS_HEIGHT = 400
-BALL_RADIUS = 5
-UPDATE_INTERVAL = 1 / 60
-PLAYER_SPEED = 8
-
-DEFAULT_PLAYER_ONE_STATE = {
-    'x': CANVAS_WIDTH / 100,
-    'y': (CANVAS_HEIGHT / 2) - (PADDLE_SIZE / 2),
-    'dy': 0,
-    'speed': PLAYER_SPEED,
-}
-
-DEFAULT_PLAYER_TWO_STATE = {
-    'x': CANVAS_WIDTH - (CANVAS_WIDTH / 100) - PADDLE_WIDTH,
-    'y': (CANVAS_HEIGHT / 2) - (PADDLE_SIZE / 2),
-    'dy': 0,
-    'speed': PLAYER_SPEED,
-}
-
-DEFAULT_BALL_STATE = {
-    'x': CANVAS_WIDTH / 2,
-    'y': CANVAS_HEIGHT / 2,
-    'dx': 5,
-    'dy': 5,
-    'radius': BALL_RADIUS,
-}
+# Mode "events" : une keyframe complète par seconde
+KEYFRAME_INTERVAL = 1
+# Collisions continues : nombre max d'impacts résolus dans un même tick
+MAX_BOUNCES_PER_TICK = 8
 
 def absadd(number, n):
     return number - n if number < 0 else number + n
 
 class Game:
-    def __init__(self, game_id, player1, player2 = None):
+    def __init__(self, game_id, player1, player2 = None, tick_rate=None, send_rate=None):
         self.game_id = game_id
+        self.usernames = {"player1": player1, "player2": player2}
+        self.created_at = time.monotonic()
+        self.ended_at = None
         self.game_over = False
         self.players = {
-            "player1": {
-                **DEFAULT_PLAYER_ONE_STATE,
-                'lifepoints': 5,
-                'disconnected': False,
-                'connected': False,
-            },
-            "player2": {
-                **DEFAULT_PLAYER_TWO_STATE,
-                'lifepoints': 5,
-                'disconnected': False,
-                'connected': False,
-            },
+            "player1": PaddleState(DEFAULT_PLAYER_ONE_STATE),
+            "player2": PaddleState(DEFAULT_PLAYER_TWO_STATE),
         }
-        self.ball_state = DEFAULT_BALL_STATE.copy()
+        self.ball_state = BallState(DEFAULT_BALL_STATE)
         self.paused = False
         self.running = False
         self.resetting = False
         self.waiting_countdown = 0
         self.channel_layer = get_channel_layer()
         self.ignore_match_act = False
+        self.physics = None
+        self.broadcast_mode = getattr(settings, 'PONG_BROADCAST_MODE', 'full')
+        self.collision_mode = getattr(settings, 'PONG_COLLISION', 'discrete')
+        self.last_event_state = None
+        self.tick = 0
+        self.tick_every = 1
+        self.phase = 0
+        self.send_countdown = 0
+        self.set_rates(
+            tick_rate or getattr(settings, 'PONG_TICK_RATE', BASE_TICK_RATE),
+            send_rate or getattr(settings, 'PONG_SEND_RATE', BASE_TICK_RATE),
+        )
+        self.binary_receivers = 0
+        self.json_receivers = 0
+        self.serialize_time = 0.0
+        self.serialized_messages = 0
+        self.random = random
+        self.game_loop = None
+        self.countdown = None
+        self.controllers = {}
 
 
     @classmethod
@@ -98,126 +93,253 @@ class Game:
 
 
 
-    async def start(self):
+    def start(self):
         self.running = True
         self.reset_pos()
-        try:
-            while self.running:
-                start_time = time.perf_counter()
-                if not self.paused:
-                    self.update_game_state()
-                await self.send_game_state()
-                elapsed = time.perf_counter() - start_time
-                sleep_time = UPDATE_INTERVAL - elapsed
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-        except asyncio.CancelledError:
-            print(f"Game {self.game_id} annulée.", flush=True)
 
     def stop(self):
         self.running = False
+        if self.ended_at is None:
+            self.ended_at = time.monotonic()
+        if self.countdown is not None:
+            self.countdown.cancel()
+
+    # Fréquence de simulation et fréquence d'envoi, indépendantes ; GameLoop.add
+    # vérifie que l'envoi tombe sur un nombre entier de ticks
+    def set_rates(self, tick_rate, send_rate):
+        self.tick_rate = tick_rate
+        self.send_rate = send_rate
+        self.step_scale = BASE_TICK_RATE / tick_rate
+        self.send_every = max(1, round(tick_rate / self.send_rate))
+
+    def should_send(self):
+        if self.broadcast_mode == "events":
+            return True
+        self.send_countdown -= 1
+        if self.send_countdown <= 0:
+            self.send_countdown = self.send_every
+            return True
+        return False
+
+    def players_ready(self):
+        return self.players["player1"].connected and (self.players["player2"].connected or self.game_id.startswith("aaaa"))
+
+    # Partie au repos : la boucle ne la fait plus avancer jusqu'au prochain
+    # changement d'état (connexion, fin de pause, fin du compte à rebours).
+    # Une déconnexion pendant une pause ou un compte à rebours la réveille
+    # pour terminer la partie.
+    def idle_state(self):
+        if not self.players_ready():
+            return "waiting"
+        if self.players['player1'].disconnected or self.players['player2'].disconnected:
+            return None
+        if self.resetting:
+            return "countdown"
+        if self.paused:
+            return "paused"
+        return None
+
+    def wake(self):
+        if self.game_loop is not None:
+            self.game_loop.refresh(self)
 
     def update_game_state(self):
-        if (not self.players["player1"]["connected"] or (not self.players["player2"]["connected"] and not self.game_id.startswith("aaaa"))):
+        if not self.players_ready():
             return
 
-        if (self.players['player1']['lifepoints'] <= 0 or
-            self.players['player2']['lifepoints'] <= 0 or
-            self.players['player1']['disconnected'] or
-            self.players['player2']['disconnected']):
+        if (self.players['player1'].lifepoints <= 0 or
+            self.players['player2'].lifepoints <= 0 or
+            self.players['player1'].disconnected or
+            self.players['player2'].disconnected):
             self.game_over = True
-        elif self.resetting:
-            self.send_game_state()
-            self.resetting = False
-            self.paused = False
+        elif self.paused:
+            return
+        elif self.physics is not None:
+            if self.controllers:
+                self.physics.sync([self])
+            self.run_controllers()
+            self.tick += 1
+            self.physics.queue(self)
         else:
+            self.run_controllers()
+            self.tick += 1
             self.ball_updater()
 
-
-    async def send_game_state(self):
-        if (not self.players["player1"]["connected"] or (not self.players["player2"]["connected"] and not self.game_id.startswith("aaaa"))):
-             await self.channel_layer.group_send(
-                 self.game_id,
-                 {
-                     "type": "game_update",
-                     "message": {
-                         "type": "waiting",
-                         "message": "En attente de l'adversaire"
-                     }
-                 }
-             )
-             await asyncio.sleep(UPDATE_INTERVAL)
-             return
+    # Joueurs pilotés dans le processus (IA) : appelés tous les `every` ticks
+    # avec la partie, ils renvoient la vitesse de leur raquette, ou None si
+    # elle ne change pas
+    def attach_controller(self, player_id, controller, every=1):
+        self.controllers[player_id] = (controller, every)
+        self.players[player_id].connected = True
+        self.wake()
+
+    def run_controllers(self):
+        for player_id, (controller, every) in self.controllers.items():
+            if self.tick % every == 0:
+                velocity = controller(self)
+                if velocity is not None:
+                    self.set_paddle_velocity(player_id, velocity)
+
+    def set_paddle_velocity(self, player_id, dy):
+        self.players[player_id].dy = dy
+        if self.physics is not None:
+            self.physics.set_paddle_dy(self, player_id, dy)
+
+    # Avec VectorPhysics, les PaddleState/BallState ne sont à jour qu'après sync
+    def sync_state(self):
+        if self.physics is not None:
+            self.physics.sync([self])
+
+    # positions : voir position_message ; sans elles, l'état est recopié
+    async def send_game_state(self, positions=None):
+        if positions is None:
+            self.sync_state()
+        if not self.players_ready():
+            await self.broadcast({
+                "type": "waiting",
+                "message": "En attente de l'adversaire"
+            })
+            return
 
         if self.game_over:
-             if self.players['player1']['lifepoints'] <= 0:
-                 reason, player = "lifepoints", "player1"
-             elif self.players['player2']['lifepoints'] <= 0:
-                 reason, player = "lifepoints", "player2"
-             elif self.players['player1']['disconnected']:
-                 reason, player = "disconnected", "player1"
-             elif self.players['player2']['disconnected']:
-                 reason, player = "disconnected", "player2"
-             else:
-                 reason, player = "Unknown", "Unknown"
-             if not self.ignore_match_act:
+            if self.players['player1'].lifepoints <= 0:
+                reason, player = "lifepoints", "player1"
+            elif self.players['player2'].lifepoints <= 0:
+                reason, player = "lifepoints", "player2"
+            elif self.players['player1'].disconnected:
+                reason, player = "disconnected", "player1"
+            elif self.players['player2'].disconnected:
+                reason, player = "disconnected", "player2"
+            else:
+                reason, player = "Unknown", "Unknown"
+            if not self.ignore_match_act:
                 await self.register_match_winner(player, self.game_id)
                 self.ignore_match_act = True
-             await self.channel_layer.group_send(
-                 self.game_id,
-                 {
-                     "type": "game_update",
-                     "message": {
-                         "type": "game_over",
-                         "message": f"{player} {reason}"
-                     }
-                 }
-             )
-             if not self.ignore_match_act:
-                await self.register_match_winner(player, self.game_id)
-             self.stop()
-             return
-        elif self.resetting:
-             for i in range(3, 0, -1):
-                 await self.channel_layer.group_send(
-                     self.game_id,
-                     {
-                         "type": "game_update",
-                         "message": {
-                             "type": "waiting",
-                             "message": f"{i}"
-                         }
-                     }
-                 )
-                 await asyncio.sleep(1)
-             self.resetting = False
-             self.paused = False
-        elif not self.paused:
-             await self.channel_layer.group_send(
-                 self.game_id,
-                 {
-                     "type": "game_update",
-                     "message": {
-                         "type": "position_update",
-                         "ball_position": {
-                             "x": self.ball_state["x"],
-                             "y": self.ball_state["y"],
-                             "dx": self.ball_state["dx"],
-                             "dy": self.ball_state["dy"],
-                         },
-                         "player1_state": {
-                             "x": self.players["player1"]["x"],
-                             "y": self.players["player1"]["y"],
-                             "lifepoints": self.players["player1"]["lifepoints"],
-                         },
-                         "player2_state": {
-                             "x": self.players["player2"]["x"],
-                             "y": self.players["player2"]["y"],
-                             "lifepoints": self.players["player2"]["lifepoints"],
-                         },
-                     },
-                 }
-             )
+            await self.broadcast({
+                "type": "game_over",
+                "message": f"{player} {reason}"
+            })
+            self.stop()
+            return
+        elif self.resetting or self.paused:
+            if self.broadcast_mode == "events":
+                await self.freeze_events()
+            return
+        elif self.broadcast_mode == "events":
+            await self.send_events()
+        else:
+            await self.broadcast(self.position_message(positions))
+
+    # PongConsumer abonnés au groupe, par protocole : broadcast n'encode que
+    # ce qu'ils attendent
+    def add_receiver(self, binary):
+        if binary:
+            self.binary_receivers += 1
+        else:
+            self.json_receivers += 1
+
+    def remove_receiver(self, binary):
+        if binary:
+            self.binary_receivers -= 1
+        else:
+            self.json_receivers -= 1
+
+    # La trame est sérialisée une seule fois ici, dans les seuls encodages
+    # utiles au groupe : "bytes" pour les clients binaires (trames de
+    # position), "text" pour les clients JSON et les autres messages. Les
+    # PongConsumer la renvoient telle quelle.
+    async def broadcast(self, message):
+        start = time.perf_counter()
+        event = {"type": "game_update", "message_type": message["type"]}
+        binary = wire.is_binary_frame(message)
+        if binary and self.binary_receivers:
+            event["bytes"] = wire.encode_frame(message)
+        if not binary or self.json_receivers:
+            event["text"] = json.dumps(message)
+        self.serialize_time += time.perf_counter() - start
+        self.serialized_messages += 1
+        await self.channel_layer.group_send(self.game_id, event)
+
+    # État compact : tick, balle (x, y, dx, dy), puis (x, y, dy, lifepoints) par joueur
+    def snapshot(self):
+        self.sync_state()
+        return (self.tick,) + self.ball_state.snapshot() + self.players['player1'].snapshot() + self.players['player2'].snapshot()
+
+    # positions : (x, y, dx, dy de la balle, y des raquettes), lues dans les
+    # tableaux de VectorPhysics sans recopie ; à défaut, dans les objets d'état
+    def position_message(self, positions=None):
+        ball, player1, player2 = self.ball_state, self.players["player1"], self.players["player2"]
+        x, y, dx, dy, p1y, p2y = positions or (ball.x, ball.y, ball.dx, ball.dy, player1.y, player2.y)
+        return {
+            "type": "position_update",
+            "tick": self.tick,
+            "ts": time.time() * 1000,
+            "rate": self.tick_rate,
+            "ball_position": {
+                "x": x,
+                "y": y,
+                "dx": dx,
+                "dy": dy,
+            },
+            "player1_state": {
+                "x": player1.x,
+                "y": p1y,
+                "lifepoints": player1.lifepoints,
+            },
+            "player2_state": {
+                "x": player2.x,
+                "y": p2y,
+                "lifepoints": player2.lifepoints,
+            },
+        }
+
+    # Mode "events" : les clients extrapolent la balle et les raquettes entre
+    # deux évènements (rebond, changement de vitesse d'une raquette, point),
+    # avec une keyframe complète toutes les KEYFRAME_INTERVAL secondes.
+    async def send_events(self):
+        ball, p1, p2 = self.ball_state, self.players['player1'], self.players['player2']
+        last = self.last_event_state
+        lifepoints = (p1.lifepoints, p2.lifepoints)
+
+        if last is None or last['lifepoints'] != lifepoints or self.tick - last['tick'] >= KEYFRAME_INTERVAL * self.tick_rate:
+            message = self.position_message()
+            message["keyframe"] = True
+            message["player1_state"]["dy"] = p1.dy
+            message["player2_state"]["dy"] = p2.dy
+            await self.broadcast(message)
+            self.last_event_state = {
+                'tick': self.tick,
+                'lifepoints': lifepoints,
+                'ball': (ball.dx, ball.dy),
+                'player1': p1.dy,
+                'player2': p2.dy,
+            }
+            return
+
+        if last['ball'] != (ball.dx, ball.dy):
+            last['ball'] = (ball.dx, ball.dy)
+            await self.broadcast({
+                "type": "ball_update",
+                "tick": self.tick,
+                "ball_position": {"x": ball.x, "y": ball.y, "dx": ball.dx, "dy": ball.dy},
+            })
+        for player_id, player in (('player1', p1), ('player2', p2)):
+            if last[player_id] != player.dy:
+                last[player_id] = player.dy
+                await self.broadcast({
+                    "type": "paddle_update",
+                    "tick": self.tick,
+                    "player": player_id,
+                    "state": {"x": player.x, "y": player.y, "dy": player.dy},
+                })
+
+    # Pause, remise au centre après un point : dernier état figé
+    async def freeze_events(self):
+        if self.last_event_state is not None:
+            self.last_event_state = None
+            message = self.position_message()
+            message["type"] = "freeze"
+            await self.broadcast(message)
 
     @database_sync_to_async
     def set_match_winner(self, game_id, loser):
@@ -236,151 +358,282 @@ class Game:
         await self.set_match_winner(game_id, loser)
 
 
+    # Partie jamais commencée : forfait du joueur absent si c'est un
+    # utilisateur, sinon la partie est annulée. Une partie dont la ligne a
+    # déjà été retirée (invitation expirée) est annulée, sans forfait.
+    async def expire(self):
+        absent = [player_id for player_id, player in self.players.items() if not player.connected]
+        if (len(absent) == 1 and self.usernames[absent[0]] and not self.game_id.startswith("aaaa")
+                and await self.match_pending()):
+            loser = absent[0]
+            self.game_over = True
+            if not self.ignore_match_act:
+                await self.register_match_winner(loser, self.game_id)
+                self.ignore_match_act = True
+            await self.send_game_over("disconnected", loser)
+        else:
+            await self.cancel_match()
+            await self.broadcast({
+                "type": "waiting",
+                "message": "Partie expirée"
+            })
+        self.stop()
+
+    @database_sync_to_async
+    def match_pending(self):
+        return SimpleMatch.objects.filter(game_id=self.game_id, winner__isnull=True).exists()
+
+    @database_sync_to_async
+    def cancel_match(self):
+        SimpleMatch.objects.filter(game_id=self.game_id, winner__isnull=True).delete()
+        TournamentMatch.objects.filter(game_id=self.game_id, winner__isnull=True).update(game_id=None)
+
     async def send_game_over(self, reason, player):
-        await self.channel_layer.group_send(
-            self.game_id,
-            {
-                "type": "game_update",
-                "message": {
-                    "type": "game_over",
-                    "message": f"{player} {reason}"
-                }
-            }
-        )
+        await self.broadcast({
+            "type": "game_over",
+            "message": f"{player} {reason}"
+        })
 
     def handle_player_action(self, player_id, action):
         if player_id not in self.players:
             return
         player_state = self.players[player_id]
         if action == "move_up":
-            player_state["dy"] = -player_state["speed"]
+            player_state.dy = -player_state.speed
         elif action == "move_down":
-            player_state["dy"] = player_state["speed"]
-        elif (action == "stop_move_down" and player_state["dy"] > 0) or (action == "stop_move_up" and player_state["dy"] < 0):
-            player_state["dy"] = 0
+            player_state.dy = player_state.speed
+        elif (action == "stop_move_down" and player_state.dy > 0) or (action == "stop_move_up" and player_state.dy < 0):
+            player_state.dy = 0
         elif action == "pause_game":
             self.paused = not self.paused
+            if not self.paused:
+                self.wake()
+            return
+        self.set_paddle_velocity(player_id, player_state.dy)
 
     def handle_player_disconnect(self, player_id):
         if player_id not in self.players:
             print("handle_player_disconnect : mauvais player_id", flush=True)
             return
-        self.players[player_id]['disconnected'] = True
+        self.players[player_id].disconnected = True
+        self.wake()
 
     def set_player_connected(self, player_id):
         if player_id in self.players:
-            self.players[player_id]['connected'] = True
+            self.players[player_id].connected = True
             print(f"[Game {self.game_id}] {player_id} CONNECTÉ !", flush=True)
+            self.wake()
         else:
             print(f"[Game {self.game_id}] Erreur : {player_id} non trouvé", flush=True)
 
     def reset_pos(self):
-        pos1 = DEFAULT_PLAYER_ONE_STATE.copy()
-        pos2 = DEFAULT_PLAYER_TWO_STATE.copy()
-        self.players['player1']['x'] = pos1['x']
-        self.players['player1']['y'] = pos1['y']
-        self.players['player1']['dy'] = pos1['dy']
-        self.players['player2']['x'] = pos2['x']
-        self.players['player2']['y'] = pos2['y']
-        self.players['player2']['dy'] = pos2['dy']
-        self.ball_state.update(DEFAULT_BALL_STATE)
+        self.players['player1'].reset(DEFAULT_PLAYER_ONE_STATE)
+        self.players['player2'].reset(DEFAULT_PLAYER_TWO_STATE)
+        self.ball_state.reset(DEFAULT_BALL_STATE)
         self.randomize_ball_direction()
-        asyncio.create_task(self.countdown_task(3))
+        self.start_countdown()
+
+    def start_countdown(self):
+        self.countdown = asyncio.create_task(self.countdown_task(3))
 
     async def countdown_task(self, countdown_seconds=3):
         self.waiting_countdown = countdown_seconds
         self.paused = True
         self.resetting = True
         while self.waiting_countdown > 0:
+            if self.players_ready():
+                await self.broadcast({
+                    "type": "waiting",
+                    "message": f"{self.waiting_countdown}"
+                })
             await asyncio.sleep(1)
             self.waiting_countdown -= 1
         self.resetting = False
         self.paused = False
+        self.wake()
 
     def randomize_ball_direction(self):
-        if math.floor(random.random() * 2):
-            self.ball_state['dx'] *= -1
-        if math.floor(random.random() * 2):
-            self.ball_state['dy'] *= -1
+        if math.floor(self.random.random() * 2):
+            self.ball_state.dx *= -1
+        if math.floor(self.random.random() * 2):
+            self.ball_state.dy *= -1
 
     def ball_updater(self):
         ball_state = self.ball_state
         players = self.players
 
-        ball_state['x'] += ball_state['dx']
-        ball_state['y'] += ball_state['dy']
+        if self.collision_mode == "swept":
+            self.swept_ball_updater()
+            return
 
-        players['player1']['y'] += players['player1']['dy']
-        if players['player1']['y'] < 0:
-            players['player1']['y'] = 0
-        if players['player1']['y'] + PADDLE_SIZE > CANVAS_HEIGHT:
-            players['player1']['y'] = CANVAS_HEIGHT - PADDLE_SIZE
+        scale = self.step_scale
+        ball_state.x += ball_state.dx * scale
+        ball_state.y += ball_state.dy * scale
 
-        players['player2']['y'] += players['player2']['dy']
-        if players['player2']['y'] < 0:
-            players['player2']['y'] = 0
-        if players['player2']['y'] + PADDLE_SIZE > CANVAS_HEIGHT:
-            players['player2']['y'] = CANVAS_HEIGHT - PADDLE_SIZE
+        self.move_paddles()
 
         # Collision avec la raquette du joueur 1
-        if (ball_state['x'] - ball_state['radius'] < players['player1']['x'] + PADDLE_WIDTH and
-            ball_state['y'] - ball_state['radius'] <= players['player1']['y'] + PADDLE_SIZE and
-            ball_state['y'] + ball_state['radius'] >= players['player1']['y']):
-            ball_state['x'] += (players['player1']['x'] + PADDLE_WIDTH) - ((ball_state['x'] - ball_state['radius']) - (players['player1']['x'] + PADDLE_WIDTH))
-            ball_state['dx'] = absadd(ball_state['dx'], 1)
-            if ball_state['y'] < players['player1']['y'] + PADDLE_SIZE / 8:
-                ball_state['dy'] = abs(ball_state['dx']) * -1
-            elif ball_state['y'] < players['player1']['y'] + (2 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = (abs(ball_state['dx']) // 2) * -1
-            elif ball_state['y'] < players['player1']['y'] + (3 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = (abs(ball_state['dx']) // 4) * -1
-            elif ball_state['y'] < players['player1']['y'] + (5 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = 0
-            elif ball_state['y'] < players['player1']['y'] + (6 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = abs(ball_state['dx']) // 4
-            elif ball_state['y'] < players['player1']['y'] + (7 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = abs(ball_state['dx']) // 2
+        if (ball_state.x - ball_state.radius < players['player1'].x + PADDLE_WIDTH and
+            ball_state.y - ball_state.radius <= players['player1'].y + PADDLE_SIZE and
+            ball_state.y + ball_state.radius >= players['player1'].y):
+            ball_state.x += (players['player1'].x + PADDLE_WIDTH) - ((ball_state.x - ball_state.radius) - (players['player1'].x + PADDLE_WIDTH))
+            ball_state.dx = absadd(ball_state.dx, 1)
+            if ball_state.y < players['player1'].y + PADDLE_SIZE / 8:
+                ball_state.dy = abs(ball_state.dx) * -1
+            elif ball_state.y < players['player1'].y + (2 * (PADDLE_SIZE / 8)):
+                ball_state.dy = (abs(ball_state.dx) // 2) * -1
+            elif ball_state.y < players['player1'].y + (3 * (PADDLE_SIZE / 8)):
+                ball_state.dy = (abs(ball_state.dx) // 4) * -1
+            elif ball_state.y < players['player1'].y + (5 * (PADDLE_SIZE / 8)):
+                ball_state.dy = 0
+            elif ball_state.y < players['player1'].y + (6 * (PADDLE_SIZE / 8)):
+                ball_state.dy = abs(ball_state.dx) // 4
+            elif ball_state.y < players['player1'].y + (7 * (PADDLE_SIZE / 8)):
+                ball_state.dy = abs(ball_state.dx) // 2
             else:
-                ball_state['dy'] = abs(ball_state['dx'])
-            ball_state['dx'] *= -1
+                ball_state.dy = abs(ball_state.dx)
+            ball_state.dx *= -1
 
         # Collision avec la raquette du joueur 2
-        if (ball_state['x'] + ball_state['radius'] > players['player2']['x'] and
-            ball_state['y'] - ball_state['radius'] <= players['player2']['y'] + PADDLE_SIZE and
-            ball_state['y'] + ball_state['radius'] >= players['player2']['y']):
-            ball_state['x'] -= (ball_state['x'] + ball_state['radius']) - players['player2']['x']
-            ball_state['dx'] = absadd(ball_state['dx'], 1)
-            if ball_state['y'] < players['player2']['y'] + PADDLE_SIZE / 8:
-                ball_state['dy'] = abs(ball_state['dx']) * -1
-            elif ball_state['y'] < players['player2']['y'] + (2 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = (abs(ball_state['dx']) // 2) * -1
-            elif ball_state['y'] < players['player2']['y'] + (3 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = (abs(ball_state['dx']) // 4) * -1
-            elif ball_state['y'] < players['player2']['y'] + (5 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = 0
-            elif ball_state['y'] < players['player2']['y'] + (6 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = abs(ball_state['dx']) // 4
-            elif ball_state['y'] < players['player2']['y'] + (7 * (PADDLE_SIZE / 8)):
-                ball_state['dy'] = abs(ball_state['dx']) // 2
+        if (ball_state.x + ball_state.radius > players['player2'].x and
+            ball_state.y - ball_state.radius <= players['player2'].y + PADDLE_SIZE and
+            ball_state.y + ball_state.radius >= players['player2'].y):
+            ball_state.x -= (ball_state.x + ball_state.radius) - players['player2'].x
+            ball_state.dx = absadd(ball_state.dx, 1)
+            if ball_state.y < players['player2'].y + PADDLE_SIZE / 8:
+                ball_state.dy = abs(ball_state.dx) * -1
+            elif ball_state.y < players['player2'].y + (2 * (PADDLE_SIZE / 8)):
+                ball_state.dy = (abs(ball_state.dx) // 2) * -1
+            elif ball_state.y < players['player2'].y + (3 * (PADDLE_SIZE / 8)):
+                ball_state.dy = (abs(ball_state.dx) // 4) * -1
+            elif ball_state.y < players['player2'].y + (5 * (PADDLE_SIZE / 8)):
+                ball_state.dy = 0
+            elif ball_state.y < players['player2'].y + (6 * (PADDLE_SIZE / 8)):
+                ball_state.dy = abs(ball_state.dx) // 4
+            elif ball_state.y < players['player2'].y + (7 * (PADDLE_SIZE / 8)):
+                ball_state.dy = abs(ball_state.dx) // 2
             else:
-                ball_state['dy'] = abs(ball_state['dx'])
-            ball_state['dx'] *= -1
+                ball_state.dy = abs(ball_state.dx)
+            ball_state.dx *= -1
 
-        if ball_state['x'] < ball_state['radius']:
-            players['player1']['lifepoints'] -= 1
-            if players['player1']['lifepoints'] > 0:
+        if ball_state.x < ball_state.radius:
+            players['player1'].lifepoints -= 1
+            if players['player1'].lifepoints > 0:
                 self.reset_pos()
-        if ball_state['x'] + ball_state['radius'] >= CANVAS_WIDTH:
-            players['player2']['lifepoints'] -= 1
-            if players['player2']['lifepoints'] > 0:
+        if ball_state.x + ball_state.radius >= CANVAS_WIDTH:
+            players['player2'].lifepoints -= 1
+            if players['player2'].lifepoints > 0:
                 self.reset_pos()
 
-        if ball_state['y'] + ball_state['radius'] > CANVAS_HEIGHT:
-            ball_state['y'] -= (ball_state['y'] + ball_state['radius']) - CANVAS_HEIGHT
-            ball_state['dy'] *= -1
-        if ball_state['y'] - ball_state['radius'] < 0:
-            ball_state['y'] = abs(ball_state['y'] - ball_state['radius'])
-            ball_state['dy'] *= -1
+        if ball_state.y + ball_state.radius > CANVAS_HEIGHT:
+            ball_state.y -= (ball_state.y + ball_state.radius) - CANVAS_HEIGHT
+            ball_state.dy *= -1
+        if ball_state.y - ball_state.radius < 0:
+            ball_state.y = abs(ball_state.y - ball_state.radius)
+            ball_state.dy *= -1
+
+    def move_paddles(self):
+        scale = self.step_scale
+        for player_id in ('player1', 'player2'):
+            player = self.players[player_id]
+            player.y += player.dy * scale
+            if player.y < 0:
+                player.y = 0
+            if player.y + PADDLE_SIZE > CANVAS_HEIGHT:
+                player.y = CANVAS_HEIGHT - PADDLE_SIZE
+
+    # Collisions continues : on calcule l'instant exact de chaque impact
+    # (murs, face des raquettes) dans le tick, rebonds multiples compris, pour
+    # que la balle ne traverse jamais une raquette quelle que soit sa vitesse.
+    # Les raquettes sont balayées elles aussi : chaque impact est testé contre
+    # leur position à cet instant, et non en fin de tick.
+    def swept_ball_updater(self):
+        ball_state = self.ball_state
+        players = self.players
+        scale = self.step_scale
+        radius = ball_state.radius
+
+        player1, player2 = players['player1'], players['player2']
+        start1, start2 = player1.y, player2.y
+        self.move_paddles()
+        face1 = player1.x + PADDLE_WIDTH
+        face2 = player2.x
+
+        elapsed = 0.0
+        for _ in range(MAX_BOUNCES_PER_TICK):
+            vx = ball_state.dx * scale
+            vy = ball_state.dy * scale
+            hit_time, surface, paddle_y = 1.0 - elapsed, None, None
+
+            if vy < 0:
+                t = (radius - ball_state.y) / vy
+                if 0 <= t <= hit_time:
+                    hit_time, surface = t, 'wall'
+            elif vy > 0:
+                t = (CANVAS_HEIGHT - radius - ball_state.y) / vy
+                if 0 <= t <= hit_time:
+                    hit_time, surface = t, 'wall'
+
+            if vx < 0 and ball_state.x - radius >= face1:
+                t = (face1 + radius - ball_state.x) / vx
+                if t <= hit_time:
+                    y = paddle_at(start1, player1.dy * scale, elapsed + t)
+                    if paddle_overlap(ball_state.y + vy * t, radius, y):
+                        hit_time, surface, paddle_y = t, 'paddle', y
+            elif vx > 0 and ball_state.x + radius <= face2:
+                t = (face2 - radius - ball_state.x) / vx
+                if t <= hit_time:
+                    y = paddle_at(start2, player2.dy * scale, elapsed + t)
+                    if paddle_overlap(ball_state.y + vy * t, radius, y):
+                        hit_time, surface, paddle_y = t, 'paddle', y
+
+            ball_state.x += vx * hit_time
+            ball_state.y += vy * hit_time
+            elapsed += hit_time
+            if surface is None:
+                break
+            if surface == 'wall':
+                ball_state.dy *= -1
+            else:
+                ball_state.dx = absadd(ball_state.dx, 1)
+                ball_state.dy = paddle_bounce(ball_state.y, paddle_y, ball_state.dx)
+                ball_state.dx *= -1
+
+        if ball_state.x < radius:
+            players['player1'].lifepoints -= 1
+            if players['player1'].lifepoints > 0:
+                self.reset_pos()
+        elif ball_state.x + radius >= CANVAS_WIDTH:
+            players['player2'].lifepoints -= 1
+            if players['player2'].lifepoints > 0:
+                self.reset_pos()
 
 def absadd(number, n):
     return number - n if number < 0 else number + n
+
+
+def paddle_overlap(ball_y, radius, paddle_y):
+    return ball_y - radius <= paddle_y + PADDLE_SIZE and ball_y + radius >= paddle_y
+
+
+# Position d'une raquette à la fraction `time` du tick, bornée comme move_paddles
+def paddle_at(start_y, velocity, time):
+    return min(max(start_y + velocity * time, 0), CANVAS_HEIGHT - PADDLE_SIZE)
+
+
+# Rebond selon la zone de la raquette touchée (8 zones)
+def paddle_bounce(ball_y, paddle_y, dx):
+    speed = abs(dx)
+    if ball_y < paddle_y + PADDLE_SIZE / 8:
+        return speed * -1
+    elif ball_y < paddle_y + (2 * (PADDLE_SIZE / 8)):
+        return (speed // 2) * -1
+    elif ball_y < paddle_y + (3 * (PADDLE_SIZE / 8)):
+        return (speed // 4) * -1
+    elif ball_y < paddle_y + (5 * (PADDLE_SIZE / 8)):
+        return 0
+    elif ball_y < paddle_y + (6 * (PADDLE_SIZE / 8)):
+        return speed // 4
+    elif ball_y < paddle_y + (7 * (PADDLE_SIZE / 8)):
+        return speed // 2
+    return speed
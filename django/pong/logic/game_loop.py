@@ -0,0 +1,174 @@
+import asyncio
+from .game import BASE_TICK_RATE
+
+# Nombre de frames entre deux rapports de retard
+REPORT_EVERY = 60 * 60
+
+
+# Nombre de périodes de `rate` dans une période de `sub_rate`, ou None s'il
+# n'est pas entier
+def divisor(rate, sub_rate):
+    every = round(rate / sub_rate)
+    if every < 1 or abs(rate / every - sub_rate) > 1e-9:
+        return None
+    return every
+
+
+# Boucle unique qui fait avancer toutes les parties du Lobby, cadencée sur des
+# échéances absolues pour ne pas dériver. Une frame qui finit après son
+# échéance est comptée en retard et les frames manquées sont sautées.
+class GameLoop:
+    def __init__(self, games, rate=BASE_TICK_RATE, physics=None, ai_pool=None):
+        self.games = games
+        self.active = {}
+        self.physics = physics
+        self.ai_pool = ai_pool
+        self.rate = rate
+        self.interval = 1 / rate
+        self.task = None
+        self.wakeup = None
+        self.frames = 0
+        self.late_frames = 0
+        self.skipped_frames = 0
+        self.max_lag = 0.0
+        self.last_report = (0, 0)
+
+    # Une partie simule une frame de boucle sur tick_every et envoie son état
+    # un tick sur send_every ; les phases sont réparties pour lisser la charge
+    # entre les frames. Seules les fréquences qui divisent celle de la boucle
+    # (simulation) ou de la simulation (envoi) sont tenues : les autres sont
+    # refusées plutôt qu'arrondies. Un envoi plus rapide que la simulation est
+    # ramené à un envoi par tick, et signalé.
+    def add(self, game):
+        tick_every = divisor(self.rate, game.tick_rate)
+        if tick_every is None:
+            print(f"[GameLoop] Partie {game.game_id} refusée : {game.tick_rate} Hz impossible avec une boucle à {self.rate} Hz.", flush=True)
+            raise ValueError(f"Fréquence de partie {game.tick_rate} Hz incompatible avec la boucle ({self.rate} Hz)")
+        if game.send_rate > game.tick_rate:
+            print(f"[GameLoop] Partie {game.game_id} : envoi à {game.send_rate} Hz ramené à {game.tick_rate} Hz, la fréquence de simulation.", flush=True)
+            game.set_rates(game.tick_rate, game.tick_rate)
+        elif divisor(game.tick_rate, game.send_rate) is None:
+            print(f"[GameLoop] Partie {game.game_id} refusée : envoi à {game.send_rate} Hz impossible avec une simulation à {game.tick_rate} Hz.", flush=True)
+            raise ValueError(f"Fréquence d'envoi {game.send_rate} Hz incompatible avec la simulation ({game.tick_rate} Hz)")
+        game.tick_every = tick_every
+        game.phase = len(self.games) % game.tick_every
+        game.game_loop = self
+        if self.physics is not None:
+            self.physics.add(game)
+        self.refresh(game)
+
+    def discard(self, game):
+        self.active.pop(game.game_id, None)
+        if self.physics is not None:
+            self.physics.remove(game)
+
+    # Seules les parties actives sont parcourues à chaque frame. Une partie au
+    # repos envoie son état une fois (attente, pause) puis n'est plus touchée
+    # jusqu'à ce qu'elle appelle Game.wake().
+    def refresh(self, game):
+        if game.running and game.idle_state() is None:
+            self.active[game.game_id] = game
+            self.wake()
+            return
+        self.active.pop(game.game_id, None)
+        if game.running:
+            asyncio.get_running_loop().create_task(game.send_game_state())
+
+    def wake(self):
+        if self.task is None or self.task.done():
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        self.wakeup.set()
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        try:
+            while True:
+                games = list(self.active.values())
+                if not games:
+                    self.wakeup.clear()
+                    await self.wakeup.wait()
+                    deadline = loop.time()
+                    continue
+
+                await self.step(games)
+
+                deadline += self.interval
+                lag = loop.time() - deadline
+                if lag > 0:
+                    self.late_frames += 1
+                    self.max_lag = max(self.max_lag, lag)
+                    missed = int(lag // self.interval)
+                    if missed:
+                        self.skipped_frames += missed
+                        deadline += missed * self.interval
+                    await asyncio.sleep(0)
+                else:
+                    await asyncio.sleep(-lag)
+        except asyncio.CancelledError:
+            print("Boucle de jeu arrêtée.", flush=True)
+
+    async def step(self, games):
+        # Physique des parties dont c'est le tour, puis envoi des états
+        frame = self.frames
+        games = [game for game in games if (frame + game.phase) % game.tick_every == 0]
+        for game in games:
+            try:
+                game.update_game_state()
+            except Exception as e:
+                print(f"[GameLoop] Erreur dans la partie {game.game_id} : {e}", flush=True)
+        if self.physics is not None:
+            self.physics.flush()
+        # Décisions des bots de cette frame, en un lot
+        if self.ai_pool is not None:
+            self.ai_pool.flush()
+        # Avec VectorPhysics, les trames complètes sont lues dans les tableaux ;
+        # le mode "events" compare les vitesses dans les objets, recopiés
+        sending = [game for game in games if game.should_send()]
+        positions = {}
+        if self.physics is not None:
+            self.physics.sync([game for game in sending if game.broadcast_mode == "events"])
+            positions = self.physics.positions([game for game in sending if game.broadcast_mode != "events"])
+        for game in sending:
+            try:
+                await game.send_game_state(positions.get(game.game_id))
+            except Exception as e:
+                print(f"[GameLoop] Erreur dans la partie {game.game_id} : {e}", flush=True)
+        for game in games:
+            if not game.running or game.idle_state() is not None:
+                self.active.pop(game.game_id, None)
+        self.frames += 1
+        if self.frames % REPORT_EVERY == 0:
+            self.report()
+
+    def report(self):
+        frames, late = self.last_report
+        late_in_window = self.late_frames - late
+        if late_in_window:
+            print(
+                f"[GameLoop] {late_in_window}/{self.frames - frames} frames en retard "
+                f"({self.skipped_frames} sautées, retard max {self.max_lag * 1000:.1f} ms, "
+                f"{len(self.games)} parties)",
+                flush=True,
+            )
+        self.last_report = (self.frames, self.late_frames)
+
+    def stats(self):
+        games = list(self.games.values())
+        serialize_time = sum(game.serialize_time for game in games)
+        return {
+            "frames": self.frames,
+            "serialized_messages": sum(game.serialized_messages for game in games),
+            "serialize_time_per_tick": serialize_time / self.frames if self.frames else 0.0,
+            "late_frames": self.late_frames,
+            "skipped_frames": self.skipped_frames,
+            "max_lag": self.max_lag,
+            "games": len(self.games),
+            "active_games": len(self.active),
+        }
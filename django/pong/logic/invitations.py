@@ -0,0 +1,64 @@
+import asyncio
+import heapq
+import time
+
+
+# Expiration des invitations à jouer : une seule tâche pour tout le processus,
+# qui dort jusqu'à la prochaine échéance d'un tas trié par expires_at. Une
+# invitation acceptée est retirée de `invitations` ; son entrée dans le tas
+# est ignorée à l'échéance. L'invitation est retirée avant la notification :
+# invitation_expired n'est envoyé qu'une fois.
+class InvitationExpiry:
+    def __init__(self, notify_expired):
+        self.invitations = {}
+        self.notify_expired = notify_expired
+        self.heap = []
+        self.wakeup = asyncio.Event()
+        self.expired = 0
+        self.cancelled = 0
+
+    def add(self, invite_id, invitation):
+        self.invitations[invite_id] = invitation
+        heapq.heappush(self.heap, (invitation["expires_at"], invite_id))
+        if self.heap[0][1] == invite_id:
+            self.wakeup.set()
+
+    def get(self, invite_id):
+        return self.invitations.get(invite_id)
+
+    def cancel(self, invite_id):
+        invitation = self.invitations.pop(invite_id, None)
+        if invitation is not None:
+            self.cancelled += 1
+        return invitation
+
+    async def run(self):
+        while True:
+            timeout = max(0, self.heap[0][0] - time.time()) if self.heap else None
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.expire(time.time())
+            except Exception as e:
+                print(f"[InvitationExpiry] Erreur : {e}", flush=True)
+
+    async def expire(self, now):
+        while self.heap and self.heap[0][0] <= now:
+            expires_at, invite_id = heapq.heappop(self.heap)
+            invitation = self.invitations.get(invite_id)
+            if invitation is None or invitation["expires_at"] != expires_at:
+                continue
+            del self.invitations[invite_id]
+            self.expired += 1
+            await self.notify_expired(invite_id, invitation)
+
+    def stats(self):
+        return {
+            "pending": len(self.invitations),
+            "scheduled": len(self.heap),
+            "expired": self.expired,
+            "cancelled": self.cancelled,
+        }
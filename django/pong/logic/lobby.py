@@ -1,11 +1,22 @@
-import uuid
 import asyncio
+import itertools
 import time
 import json
 from ..models import SimpleMatch, CustomUser
-from .game import Game
-from .ai_player import AIPlayer, launch_ai
+from .game import Game, BASE_TICK_RATE
+from .ai_player import AIPlayer
+from .ai_pool import AIPool
+from .game_loop import GameLoop
+from .reaper import GameReaper
+from .matchmaking import MatchmakingQueue, Matchmaker
+from .invitations import InvitationExpiry
+from .presence import PresenceRegistry
+from . import workers
 from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+AI_FULL_MESSAGE = "Trop de parties contre l'IA en cours, réessayez plus tard."
 
 class Lobby:
     _instance = None
@@ -20,98 +31,149 @@ class Lobby:
         if Lobby._instance is not None:
             raise Exception("Lobby est un singleton, utilisez get_instance() pour y accéder.")
         Lobby._instance = self
-        self.waiting_queue = {}
+        self.waiting_queue = MatchmakingQueue()
+        self.matchmaker = Matchmaker(self.waiting_queue, self.start_game, self.send_queue_status)
         self.active_games = {}
+        self.loading = {}
+        self.refused = {}
+        self.next_worker = itertools.count()
+        self.ai_pool = AIPool(
+            workers=getattr(settings, 'PONG_AI_WORKERS', 1),
+            max_bots=getattr(settings, 'PONG_MAX_AI_BOTS', 200),
+        )
+        self.game_loop = GameLoop(
+            self.active_games,
+            rate=getattr(settings, 'PONG_TICK_RATE', BASE_TICK_RATE),
+            physics=self.create_physics(),
+            ai_pool=self.ai_pool,
+        )
+        self.reaper = GameReaper(
+            self,
+            connect_timeout=getattr(settings, 'PONG_CONNECT_TIMEOUT', 120),
+            finished_ttl=getattr(settings, 'PONG_FINISHED_TTL', 30),
+        )
+        self.invitations = InvitationExpiry(self.send_invitation_expired)
+        self.presence = PresenceRegistry()
         try:
             loop = asyncio.get_running_loop()
-            loop.create_task(self.matchmaking())
+            loop.create_task(self.matchmaker.run())
+            loop.create_task(self.reaper.run())
+            loop.create_task(self.invitations.run())
+            loop.create_task(self.presence.run())
         except RuntimeError:
             print("Aucune boucle d'événements active lors de l'instanciation de Lobby.")
 
     async def API_start_game_async(self, player_id1, player_id2):
-        game_id = str(uuid.uuid4())
-        game = await Game.create(game_id, player_id1, player_id2)
-        self.active_games[game_id] = game
-        asyncio.create_task(game.start())
+        game_id = workers.new_game_id(next(self.next_worker))
+        await self.host_game(game_id, player_id1, player_id2)
         return game_id
 
+    # La ligne SimpleMatch est toujours créée ici ; la partie n'est lancée que
+    # si ce processus en est propriétaire, sinon son worker la charge à la
+    # première connexion (get_or_load_game). None si le lancement est refusé.
+    async def host_game(self, game_id, player1, player2=None):
+        game = await Game.create(game_id, player1, player2)
+        if workers.owns(game_id) and not self.launch_game(game):
+            await self.refuse_game(game_id)
+            return None
+        return game
+
+    def create_physics(self):
+        if getattr(settings, 'PONG_PHYSICS_BACKEND', 'python') == 'numpy':
+            if getattr(settings, 'PONG_COLLISION', 'discrete') == 'swept':
+                print("VectorPhysics ne gère que les collisions discrètes, moteur python utilisé.", flush=True)
+                return None
+            from .vector_physics import VectorPhysics
+            return VectorPhysics()
+        return None
+
+    # Partie solo (pas de second joueur, pas locale) : l'IA est attachée à la
+    # partie là où elle tourne, y compris quand un worker la charge. Le
+    # plafond de bots est celui de ce processus : sans place, la partie n'est
+    # pas lancée et False est renvoyé.
+    def launch_game(self, game):
+        ai = None
+        if game.usernames["player2"] is None and not game.game_id.startswith("aaaa"):
+            if self.ai_pool.full():
+                print(f"Partie {game.game_id} refusée : {len(self.ai_pool.bots)} bots en cours.", flush=True)
+                return False
+            ai = AIPlayer("player2")
+            self.ai_pool.register(ai)
+        self.active_games[game.game_id] = game
+        if ai is not None:
+            game.attach_controller("player2", ai)
+        game.start()
+        try:
+            self.game_loop.add(game)
+        except ValueError:
+            # Fréquence refusée par la boucle (déjà signalée) : rien ne reste actif
+            self.remove_game(game.game_id)
+            raise
+        return True
+
+    # Partie jamais jouée (refusée, invitation expirée) : sa ligne SimpleMatch est retirée
+    async def refuse_game(self, game_id):
+        await database_sync_to_async(
+            lambda: SimpleMatch.objects.filter(game_id=game_id, winner__isnull=True).delete()
+        )()
+
     def get_queue_len(self):
         return len(self.waiting_queue)
 
     def add_player_to_queue(self, player_consumer, ratio):
-        for existing_consumer in self.waiting_queue.keys():
-            if hasattr(existing_consumer, 'user') and hasattr(player_consumer, 'user'):
-                if existing_consumer.user.username == player_consumer.user.username:
-                    print(f"L'utilisateur {player_consumer.user.username} est déjà dans la file.")
-                    return
-        self.waiting_queue[player_consumer] = {
-            "ratio": ratio,
-            "timestamp": time.time()
-        }
+        user = getattr(player_consumer, 'user', None)
+        replaced = self.waiting_queue.add(player_consumer, ratio, time.time(), user.id if user else None)
+        if replaced is not None:
+            print(f"L'utilisateur {user.username} reprend sa place dans la file.")
+        self.matchmaker.wake()
 
 
     def remove_player_from_queue(self, player_consumer):
         if player_consumer in self.waiting_queue:
-            del self.waiting_queue[player_consumer]
+            self.waiting_queue.remove(player_consumer)
+            self.matchmaker.wake()
 
     def remove_game(self, game_id):
         if game_id in self.active_games:
             game = self.active_games.pop(game_id, None)
             if game:
                 game.stop()
+                self.game_loop.discard(game)
+                for controller, _ in game.controllers.values():
+                    self.ai_pool.release(controller)
                 print(f"Partie {game_id} supprimée.")
 
-    async def matchmaking(self):
-        while True:
-            if len(self.waiting_queue) < 2:
-                for player in self.waiting_queue:
-                    await player.send(json.dumps({"type": "waiting", "message": "En attente d'un adversaire"}))
-                await asyncio.sleep(1)
-                continue
-
-            current_time = time.time()
-
-            for player1, data1 in list(self.waiting_queue.items()):
-                ratio1, timestamp1 = data1["ratio"], data1["timestamp"]
-                best_match = None
-                best_match_time = float('inf')
-
-                for player2, data2 in list(self.waiting_queue.items()):
-                    if player1 == player2:
-                        continue
-
-                    ratio2, timestamp2 = data2["ratio"], data2["timestamp"]
-                    elapsed_time = current_time - timestamp1
-                    ratio_diff = abs(ratio1 - ratio2)
-
-                    if (elapsed_time < 10 and ratio_diff <= 0.1) or \
-                       (10 <= elapsed_time < 20 and ratio_diff <= 0.2) or \
-                       (elapsed_time >= 20):
-
-                        if timestamp2 < best_match_time:
-                            best_match = player2
-                            best_match_time = timestamp2
-
-                if best_match:
-                    await self.start_game(player1, best_match)
-                else:
-                    await player1.send(json.dumps({"type": "waiting", "message": "En attente d'un adversaire"}))
-            await asyncio.sleep(1)
+    # Invitation jamais acceptée : sa partie est annulée, personne ne perd par
+    # forfait. Si un autre worker l'héberge, la ligne supprimée suffit :
+    # Game.expire ne compte pas de forfait pour une partie annulée.
+    async def send_invitation_expired(self, invite_id, invitation):
+        game_id = invitation["game_id"]
+        await self.refuse_game(game_id)
+        game = self.active_games.get(game_id)
+        if game is not None:
+            await game.broadcast({"type": "waiting", "message": "Invitation expirée"})
+            self.remove_game(game_id)
+        channel_layer = get_channel_layer()
+        for user_id in (invitation["from_id"], invitation["to_id"]):
+            await channel_layer.group_send(f"user_{user_id}", {
+                "type": "invitation_expired",
+                "invite_id": invite_id,
+            })
+
+    async def send_queue_status(self, player, status):
+        await player.send(json.dumps({"type": "queue_status", **status}))
 
     async def start_game(self, player1, player2):
         if player1 not in self.waiting_queue or player2 not in self.waiting_queue:
             print("Un ou plusieurs joueurs ne sont plus dans la file d'attente.", flush=True)
             return None
 
-        game_id = str(uuid.uuid4())
+        game_id = workers.new_game_id(next(self.next_worker))
 
-        game = await Game.create(game_id, player1.scope["user"].username, player2.scope["user"].username)
-        self.active_games[game_id] = game
+        await self.host_game(game_id, player1.scope["user"].username, player2.scope["user"].username)
         self.remove_player_from_queue(player1)
         self.remove_player_from_queue(player2)
 
-        asyncio.create_task(game.start())
-
         await player1.send(json.dumps({
             "type": "game_found",
             "game_id": game_id,
@@ -127,31 +189,22 @@ class Lobby:
 
         return game_id
 
+    # Plus de place pour un bot dans ce processus : pas de partie. Si la
+    # partie revient à un autre worker, c'est lui qui refuse au chargement.
     async def create_solo_game(self, player_consumer):
-        game_id = str(uuid.uuid4())
-
-        game = await Game.create(game_id, player_consumer.scope['user'].username)
-        
-        ai_bot = asyncio.create_task(launch_ai("localhost", game_id))
+        game_id = workers.new_game_id(next(self.next_worker))
 
-        self.active_games[game_id] = game
-
-        asyncio.create_task(game.start())
+        if await self.host_game(game_id, player_consumer.scope['user'].username) is None:
+            return None, player_consumer
 
         return game_id, player_consumer
 
 
     async def create_local_game(self, player_consumer):
 
-        game_id = str(uuid.uuid4())
-        game_id = game_id[4:]
-        game_id = "aaaa" + game_id
-
-        game = await Game.create(game_id, player_consumer.scope['user'].username)
+        game_id = workers.new_game_id(next(self.next_worker), prefix="aaaa")
 
-        self.active_games[game_id] = game
-
-        asyncio.create_task(game.start())
+        await self.host_game(game_id, player_consumer.scope['user'].username)
 
         return game_id, player_consumer
 
@@ -159,3 +212,31 @@ class Lobby:
     def get_game(self, game_id):
         return self.active_games.get(game_id)
 
+    def game_exists(self, game_id):
+        return game_id in self.active_games or not workers.owns(game_id)
+
+    async def get_or_load_game(self, game_id):
+        game = self.active_games.get(game_id)
+        if game is not None or workers.worker_count() == 1 or not workers.owns(game_id):
+            return game
+        task = self.loading.get(game_id)
+        if task is None:
+            task = self.loading[game_id] = asyncio.ensure_future(self.load_game(game_id))
+            task.add_done_callback(lambda _: self.loading.pop(game_id, None))
+        return await asyncio.shield(task)
+
+    async def load_game(self, game_id):
+        match = await database_sync_to_async(
+            lambda: SimpleMatch.objects.select_related('player1', 'player2').filter(game_id=game_id, winner__isnull=True).first()
+        )()
+        if match is None:
+            return None
+        game = Game(game_id, match.player1.username, match.player2.username if match.player2 else None)
+        if not self.launch_game(game):
+            await self.refuse_game(game_id)
+            # Lu par le PongConsumer dont la connexion a déclenché le chargement
+            self.refused[game_id] = AI_FULL_MESSAGE
+            return None
+        print(f"[Worker {workers.current_worker()}] Partie {game_id} chargée.", flush=True)
+        return game
+
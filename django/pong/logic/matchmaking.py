@@ -0,0 +1,218 @@
+import asyncio
+import itertools
+import math
+import time
+from collections import OrderedDict, deque
+
+# Largeur des tranches de ratio de l'index
+BUCKET_WIDTH = 0.02
+# Marge pour les arrondis aux bords de la fenêtre
+EPSILON = 1e-9
+
+
+# Règles d'équité : l'écart de ratio toléré s'élargit avec l'attente du joueur
+def within_window(elapsed_time, ratio_diff):
+    return (elapsed_time < 10 and ratio_diff <= 0.1) or \
+           (10 <= elapsed_time < 20 and ratio_diff <= 0.2) or \
+           (elapsed_time >= 20)
+
+
+# Instants où la fenêtre d'un joueur s'élargit (secondes d'attente)
+WIDENING_STEPS = (10, 20)
+# Estimation d'attente : débit de sortie de file sur cette durée, arrondi
+RATE_WINDOW = 60
+ETA_STEP = 5
+
+
+def window_for(elapsed_time):
+    if elapsed_time < 10:
+        return 0.1
+    if elapsed_time < 20:
+        return 0.2
+    return None
+
+
+def bucket_of(ratio):
+    return math.floor(ratio / BUCKET_WIDTH)
+
+
+# File d'attente indexée par tranches de ratio, chaque tranche gardant ses
+# joueurs dans l'ordre d'arrivée. Pour un joueur, seules les tranches de sa
+# fenêtre sont visitées et le premier joueur éligible de chaque tranche est le
+# plus ancien : le choix est le même que le parcours de toutes les paires
+# (adversaire éligible arrivé le plus tôt). OrderedDict plutôt que dict : les
+# retraits en tête ne laissent pas de cases vides à sauter à chaque parcours.
+#
+# Les entrées sont indexées par utilisateur (ou par consumer sans user_id) :
+# un utilisateur qui revient en file depuis un autre consumer (onglet,
+# reconnexion) reprend son entrée, sa place et son attente.
+class MatchmakingQueue:
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.consumers = {}
+        self.buckets = {}
+        self.sequence = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, consumer):
+        return consumer in self.consumers
+
+    def __iter__(self):
+        return iter([entry["consumer"] for entry in self.entries.values()])
+
+    def get(self, consumer):
+        key = self.consumers.get(consumer)
+        return None if key is None else self.entries[key]
+
+    # Renvoie le consumer remplacé si l'utilisateur était déjà en file
+    def add(self, consumer, ratio, timestamp=None, user_id=None):
+        key = consumer if user_id is None else user_id
+        entry = self.entries.get(key)
+        if entry is not None:
+            replaced = entry["consumer"]
+            if replaced is not consumer:
+                del self.consumers[replaced]
+                entry["consumer"] = consumer
+                self.consumers[consumer] = key
+                return replaced
+            return None
+
+        self.remove(consumer)
+        entry = {
+            "consumer": consumer,
+            "ratio": ratio,
+            "timestamp": time.time() if timestamp is None else timestamp,
+            "order": next(self.sequence),
+        }
+        self.entries[key] = entry
+        self.consumers[consumer] = key
+        self.buckets.setdefault(bucket_of(ratio), OrderedDict())[key] = entry
+        return None
+
+    def remove(self, consumer):
+        key = self.consumers.pop(consumer, None)
+        if key is None:
+            return
+        entry = self.entries.pop(key)
+        bucket_key = bucket_of(entry["ratio"])
+        bucket = self.buckets[bucket_key]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[bucket_key]
+
+    def find_match(self, consumer, current_time):
+        entry = self.get(consumer)
+        ratio = entry["ratio"]
+        elapsed_time = current_time - entry["timestamp"]
+        window = window_for(elapsed_time)
+
+        if window is None:
+            for other in self.entries.values():
+                if other is not entry:
+                    return other["consumer"]
+            return None
+
+        # Les tranches intérieures sont entièrement dans la fenêtre, seules
+        # celles des bords demandent de tester chaque joueur
+        best_match, best_key = None, None
+        first, last = bucket_of(ratio - window - EPSILON), bucket_of(ratio + window + EPSILON)
+        for key in range(first, last + 1):
+            bucket = self.buckets.get(key)
+            if not bucket:
+                continue
+            edge = key == first or key == last
+            for data in bucket.values():
+                if data is entry or (edge and not within_window(elapsed_time, abs(ratio - data["ratio"]))):
+                    continue
+                candidate = (data["timestamp"], data["order"])
+                if best_key is None or candidate < best_key:
+                    best_match, best_key = data["consumer"], candidate
+                break
+        return best_match
+
+    # Un passage : chaque joueur encore en file, dans l'ordre d'arrivée, avec
+    # son adversaire ou None. L'appelant retire les joueurs appariés avant de
+    # demander la paire suivante.
+    def pairs(self, current_time):
+        for consumer in self:
+            if consumer in self.consumers:
+                yield consumer, self.find_match(consumer, current_time)
+
+    # Délai avant le prochain élargissement de fenêtre d'un joueur en file, ou
+    # None. Les joueurs sont dans l'ordre d'arrivée : on s'arrête au premier
+    # qui n'a pas encore atteint le premier palier.
+    def next_widening(self, current_time):
+        deadline = None
+        for data in self.entries.values():
+            for step in WIDENING_STEPS:
+                if data["timestamp"] + step > current_time:
+                    if deadline is None or data["timestamp"] + step < deadline:
+                        deadline = data["timestamp"] + step
+                    break
+            if data["timestamp"] + WIDENING_STEPS[0] > current_time:
+                break
+        return None if deadline is None else max(0, deadline - current_time)
+
+
+# Boucle de matchmaking pilotée par les évènements : un passage dès que la
+# file change (wake) ou qu'une fenêtre s'élargit, et rien sinon. Après chaque
+# passage, un joueur ne reçoit son état (position, fenêtre, attente estimée)
+# que s'il a changé depuis le dernier envoi.
+class Matchmaker:
+    def __init__(self, queue, start_game, notify_status):
+        self.queue = queue
+        self.start_game = start_game
+        self.notify_status = notify_status
+        self.wakeup = asyncio.Event()
+        self.passes = 0
+        self.matches = deque()
+        self.sent = {}
+        self.notifications = 0
+
+    def wake(self):
+        self.wakeup.set()
+
+    async def run(self):
+        while True:
+            timeout = self.queue.next_widening(time.time())
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.run_pass()
+            except Exception as e:
+                print(f"[Matchmaker] Erreur : {e}", flush=True)
+
+    async def run_pass(self):
+        self.passes += 1
+        current_time = time.time()
+        if len(self.queue) >= 2:
+            for player1, best_match in self.queue.pairs(current_time):
+                if best_match:
+                    self.matches.append(current_time)
+                    await self.start_game(player1, best_match)
+        await self.notify_queue(time.time())
+
+    async def notify_queue(self, current_time):
+        while self.matches and self.matches[0] < current_time - RATE_WINDOW:
+            self.matches.popleft()
+        departure_rate = 2 * len(self.matches) / RATE_WINDOW
+
+        sent, self.sent = self.sent, {}
+        for position, player in enumerate(self.queue, start=1):
+            entry = self.queue.get(player)
+            if entry is None:
+                continue
+            status = {
+                "position": position,
+                "window": window_for(current_time - entry["timestamp"]),
+                "eta": math.ceil(position / departure_rate / ETA_STEP) * ETA_STEP if departure_rate else None,
+            }
+            self.sent[player] = status
+            if sent.get(player) != status:
+                self.notifications += 1
+                await self.notify_status(player, status)
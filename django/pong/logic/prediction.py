@@ -0,0 +1,64 @@
+import math
+import numpy as np
+from .constants import CANVAS_WIDTH, CANVAS_HEIGHT, PADDLE_WIDTH, BALL_RADIUS, DEFAULT_PLAYER_TWO_STATE
+
+# Modèle de l'IA : la raquette du joueur 1 renvoie la balle à plat (dy = 0,
+# |dx| + 1) depuis cette ligne, et la balle est attendue sur la ligne de la
+# raquette du joueur 2
+LEFT_LINE = PADDLE_WIDTH + (CANVAS_WIDTH // 100) + BALL_RADIUS
+RIGHT_LINE = DEFAULT_PLAYER_TWO_STATE['x'] - BALL_RADIUS
+# Le centre de la balle reste dans [BALL_RADIUS, CANVAS_HEIGHT - BALL_RADIUS]
+SPAN = CANVAS_HEIGHT - 2 * BALL_RADIUS
+
+
+# Rebonds sur les bords par dépliage : la trajectoire rectiligne est repliée
+# dans la bande, quel que soit le nombre de frames. Game recale la balle sur
+# le bord au lieu de la réfléchir : écart d'au plus |dy| par rebond.
+def fold(y):
+    m = (y - BALL_RADIUS) % (2 * SPAN)
+    return BALL_RADIUS + (m if m <= SPAN else 2 * SPAN - m)
+
+
+# Frames jusqu'au franchissement de la ligne (au moins une : la balle bouge
+# avant d'être testée)
+def frames_to(distance, speed):
+    return max(1, math.ceil(distance / speed))
+
+
+# Où et quand la balle franchit la ligne du joueur 2, en O(1) : renvoie
+# (frames avant impact, x, y), les frames comptées à partir de 0 comme
+# l'ancienne simulation pas à pas
+def predict(x, y, dx, dy):
+    if dx == 0:
+        return 0, x, CANVAS_HEIGHT // 2
+    if dx < 0:
+        # Renvoi par le joueur 1 : dy est annulé avant le déplacement vertical
+        # de cette frame, la balle repart ensuite à plat
+        n = frames_to(x - LEFT_LINE, -dx)
+        y = fold(y + (n - 1) * dy)
+        x, frames, dx, dy = LEFT_LINE, n, -dx + 1, 0
+    else:
+        frames = 0
+    n = frames_to(RIGHT_LINE - x, dx)
+    return frames + n - 1, x + n * dx, fold(y + n * dy)
+
+
+# Même calcul pour un lot de balles (tableaux numpy de même taille)
+def predict_batch(x, y, dx, dy):
+    x, y, dx, dy = (np.asarray(a, dtype=float) for a in (x, y, dx, dy))
+    left = dx < 0
+    safe_dx = np.where(dx == 0, 1, np.abs(dx))
+
+    n1 = np.where(left, np.maximum(1, np.ceil((x - LEFT_LINE) / safe_dx)), 0)
+    y = np.where(left, y + (n1 - 1) * dy, y)
+    x = np.where(left, LEFT_LINE, x)
+    speed = np.where(left, safe_dx + 1, safe_dx)
+    dy = np.where(left, 0, dy)
+
+    n2 = np.maximum(1, np.ceil((RIGHT_LINE - x) / speed))
+    m = (y + n2 * dy - BALL_RADIUS) % (2 * SPAN)
+    y = BALL_RADIUS + np.where(m <= SPAN, m, 2 * SPAN - m)
+
+    still = dx == 0
+    frames = np.where(still, 0, n1 + n2 - 1)
+    return frames, np.where(still, x, x + n2 * speed), np.where(still, CANVAS_HEIGHT // 2, y)
@@ -0,0 +1,85 @@
+import asyncio
+from channels.db import database_sync_to_async
+from ..models import CustomUser
+
+# Intervalle entre deux écritures de online_status en base (secondes)
+SYNC_INTERVAL = 1
+
+
+# Utilisateurs en ligne sur le chat, tenus en mémoire : un compteur de
+# connexions par utilisateur (plusieurs onglets), si bien qu'il ne passe hors
+# ligne qu'à la fermeture de sa dernière connexion. connect()/disconnect()
+# disent si l'état a changé, pour n'envoyer qu'un delta aux autres. Les
+# changements sont recopiés dans CustomUser.online_status en tâche de fond,
+# par lots, le dernier état l'emportant.
+class PresenceRegistry:
+    def __init__(self, sync_interval=SYNC_INTERVAL):
+        self.connections = {}
+        self.usernames = {}
+        self.pending = {}
+        self.sync_interval = sync_interval
+        self.writes = 0
+
+    def __contains__(self, user_id):
+        return user_id in self.connections
+
+    def connect(self, user_id, username):
+        count = self.connections.get(user_id, 0)
+        self.connections[user_id] = count + 1
+        self.usernames[user_id] = username
+        if count == 0:
+            self.pending[user_id] = True
+            return True
+        return False
+
+    def disconnect(self, user_id):
+        count = self.connections.get(user_id, 0)
+        if count > 1:
+            self.connections[user_id] = count - 1
+            return False
+        if count == 0:
+            return False
+        del self.connections[user_id]
+        self.usernames.pop(user_id, None)
+        self.pending[user_id] = False
+        return True
+
+    def snapshot(self):
+        return [{"username": username} for username in self.usernames.values()]
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"[PresenceRegistry] Erreur : {e}", flush=True)
+
+    async def sync(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        try:
+            await self.write(pending)
+        except Exception:
+            # Les changements plus récents restent prioritaires
+            self.pending = {**pending, **self.pending}
+            raise
+
+    @database_sync_to_async
+    def write(self, pending):
+        online = [user_id for user_id, state in pending.items() if state]
+        offline = [user_id for user_id, state in pending.items() if not state]
+        if online:
+            CustomUser.objects.filter(id__in=online).update(online_status=True)
+        if offline:
+            CustomUser.objects.filter(id__in=offline).update(online_status=False)
+        self.writes += 1
+
+    def stats(self):
+        return {
+            "online": len(self.connections),
+            "connections": sum(self.connections.values()),
+            "pending": len(self.pending),
+            "writes": self.writes,
+        }
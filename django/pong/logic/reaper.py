@@ -0,0 +1,89 @@
+import asyncio
+import time
+from datetime import timedelta
+from channels.db import database_sync_to_async
+from django.utils import timezone
+from ..models import SimpleMatch, TournamentMatch
+from . import workers
+
+# Intervalle entre deux passages (secondes)
+REAP_INTERVAL = 5
+
+
+# Libère les parties du Lobby qui n'avancent plus : jamais commencées après
+# connect_timeout (forfait ou annulation, voir Game.expire) et terminées
+# depuis plus de finished_ttl sans que les joueurs se déconnectent.
+#
+# Avec plusieurs workers, le processus qui crée la ligne SimpleMatch n'est pas
+# toujours celui qui héberge la partie, et ce dernier ne la construit qu'à la
+# première connexion. Chaque worker annule donc aussi les lignes sans
+# vainqueur plus vieilles que connect_timeout dont il est propriétaire mais
+# qu'il ne tient pas en mémoire : personne ne les a jamais rejointes.
+class GameReaper:
+    def __init__(self, lobby, connect_timeout, finished_ttl, interval=REAP_INTERVAL):
+        self.lobby = lobby
+        self.connect_timeout = connect_timeout
+        self.finished_ttl = finished_ttl
+        self.interval = interval
+        self.expired = 0
+        self.finished = 0
+        self.unjoined = 0
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"[GameReaper] Erreur : {e}", flush=True)
+
+    async def sweep(self):
+        now = time.monotonic()
+        expired, finished, unjoined = self.expired, self.finished, self.unjoined
+        for game in list(self.lobby.active_games.values()):
+            if game.ended_at is not None:
+                if now - game.ended_at >= self.finished_ttl:
+                    self.lobby.remove_game(game.game_id)
+                    self.finished += 1
+            elif not game.players_ready() and now - game.created_at >= self.connect_timeout:
+                try:
+                    await game.expire()
+                finally:
+                    self.lobby.remove_game(game.game_id)
+                    self.expired += 1
+        await self.sweep_unjoined()
+        if self.expired != expired or self.finished != finished or self.unjoined != unjoined:
+            print(
+                f"[GameReaper] {len(self.lobby.active_games)} parties en cours, "
+                f"{self.expired - expired} expirées, {self.finished - finished} terminées supprimées, "
+                f"{self.unjoined - unjoined} jamais rejointes annulées",
+                flush=True,
+            )
+
+    async def sweep_unjoined(self):
+        cutoff = timezone.now() - timedelta(seconds=self.connect_timeout)
+        game_ids = [
+            game_id for game_id in await self.pending_matches(cutoff)
+            if game_id and workers.owns(game_id)
+            and game_id not in self.lobby.active_games and game_id not in self.lobby.loading
+        ]
+        if game_ids:
+            await self.cancel_matches(game_ids)
+            self.unjoined += len(game_ids)
+
+    @database_sync_to_async
+    def pending_matches(self, cutoff):
+        return list(SimpleMatch.objects.filter(winner__isnull=True, created_at__lt=cutoff).values_list('game_id', flat=True))
+
+    @database_sync_to_async
+    def cancel_matches(self, game_ids):
+        SimpleMatch.objects.filter(game_id__in=game_ids, winner__isnull=True).delete()
+        TournamentMatch.objects.filter(game_id__in=game_ids, winner__isnull=True).update(game_id=None)
+
+    def stats(self):
+        return {
+            "live": len(self.lobby.active_games),
+            "expired": self.expired,
+            "finished": self.finished,
+            "unjoined": self.unjoined,
+        }
@@ -0,0 +1,77 @@
+import random
+from .game import Game, BASE_TICK_RATE
+
+# Limite par défaut d'une simulation (10 minutes de jeu à 60 Hz)
+MAX_TICKS = 60 * 60 * 10
+
+
+# Partie sans réseau ni base de données ni asyncio : les ticks s'enchaînent
+# aussi vite que le CPU le permet, le hasard vient d'une graine et le compte à
+# rebours après un point est compté en ticks.
+class HeadlessGame(Game):
+    def __init__(self, seed=None, tick_rate=BASE_TICK_RATE, collision_mode=None, countdown=0):
+        super().__init__("headless", "player1", "player2", tick_rate=tick_rate, send_rate=tick_rate)
+        self.random = random.Random(seed)
+        if collision_mode is not None:
+            self.collision_mode = collision_mode
+        self.countdown_ticks = round(countdown * self.tick_rate)
+        self.frozen_ticks = 0
+        for player in self.players.values():
+            player.connected = True
+
+    def start_countdown(self):
+        self.frozen_ticks = self.countdown_ticks
+
+    # Même ordre que Game.update_game_state : contrôleurs, tick, physique
+    def step(self):
+        if self.frozen_ticks > 0:
+            self.frozen_ticks -= 1
+            self.tick += 1
+        elif self.paused:
+            self.tick += 1
+        else:
+            self.run_controllers()
+            self.tick += 1
+            self.ball_updater()
+        if self.players['player1'].lifepoints <= 0 or self.players['player2'].lifepoints <= 0:
+            self.game_over = True
+            self.stop()
+
+    def winner(self):
+        if self.players['player1'].lifepoints <= 0:
+            return "player2"
+        if self.players['player2'].lifepoints <= 0:
+            return "player1"
+        return None
+
+
+# inputs : (tick, player_id, action) triés par tick, appliqués avant ce tick.
+# controllers : {player_id: fonction(game) -> vitesse ou None}, attachés comme
+# dans le Lobby (Game.attach_controller) et appelés à chaque tick.
+# Renvoie l'état final et, si trace_every > 0, un snapshot tous les trace_every ticks.
+def simulate(seed=None, inputs=(), controllers=None, max_ticks=MAX_TICKS, trace_every=0,
+             tick_rate=BASE_TICK_RATE, collision_mode=None, countdown=0):
+    game = HeadlessGame(seed, tick_rate=tick_rate, collision_mode=collision_mode, countdown=countdown)
+    game.running = True
+    game.reset_pos()
+
+    inputs = iter(inputs)
+    pending = next(inputs, None)
+    for player_id, controller in (controllers or {}).items():
+        game.attach_controller(player_id, controller)
+    trace = []
+
+    while game.running and game.tick < max_ticks:
+        while pending is not None and pending[0] <= game.tick + 1:
+            game.handle_player_action(pending[1], pending[2])
+            pending = next(inputs, None)
+        game.step()
+        if trace_every and game.tick % trace_every == 0:
+            trace.append(game.snapshot())
+
+    return {
+        "winner": game.winner(),
+        "ticks": game.tick,
+        "state": game.snapshot(),
+        "trace": trace,
+    }
@@ -0,0 +1,34 @@
+class PaddleState:
+    __slots__ = ('x', 'y', 'dy', 'speed', 'lifepoints', 'connected', 'disconnected')
+
+    def __init__(self, default, lifepoints=5):
+        self.reset(default)
+        self.speed = default['speed']
+        self.lifepoints = lifepoints
+        self.connected = False
+        self.disconnected = False
+
+    def reset(self, default):
+        self.x = default['x']
+        self.y = default['y']
+        self.dy = default['dy']
+
+    def snapshot(self):
+        return (self.x, self.y, self.dy, self.lifepoints)
+
+
+class BallState:
+    __slots__ = ('x', 'y', 'dx', 'dy', 'radius')
+
+    def __init__(self, default):
+        self.reset(default)
+
+    def reset(self, default):
+        self.x = default['x']
+        self.y = default['y']
+        self.dx = default['dx']
+        self.dy = default['dy']
+        self.radius = default['radius']
+
+    def snapshot(self):
+        return (self.x, self.y, self.dx, self.dy)
@@ -0,0 +1,195 @@
+import numpy as np
+from .constants import (
+    CANVAS_WIDTH, CANVAS_HEIGHT, PADDLE_SIZE, PADDLE_WIDTH, BALL_RADIUS,
+    DEFAULT_PLAYER_ONE_STATE, DEFAULT_PLAYER_TWO_STATE,
+)
+
+# Une colonne par champ, une ligne par partie
+BX, BY, BDX, BDY, P1Y, P1DY, P2Y, P2DY, P1LP, P2LP, SCALE = range(11)
+FIELDS = 11
+
+P1_X = DEFAULT_PLAYER_ONE_STATE['x']
+P2_X = DEFAULT_PLAYER_TWO_STATE['x']
+
+# Les 8 zones de la raquette : seuils (multiples de PADDLE_SIZE / 8) et
+# rebond associé, dy = signe * (|dx| // diviseur)
+ZONE_OFFSETS = np.array([PADDLE_SIZE / 8] + [k * (PADDLE_SIZE / 8) for k in (2, 3, 5, 6, 7)])
+ZONE_SIGN = np.array([-1, -1, -1, 0, 1, 1, 1], dtype=float)
+ZONE_DIVISOR = np.array([1, 2, 4, 1, 4, 2, 1], dtype=float)
+
+
+def _absadd(values, n):
+    return np.where(values < 0, values - n, values + n)
+
+
+def _paddle_bounce(y, paddle_y, dx):
+    zone = (y[:, None] >= paddle_y[:, None] + ZONE_OFFSETS).sum(axis=1)
+    return ZONE_SIGN[zone] * (np.abs(dx) // ZONE_DIVISOR[zone])
+
+
+# L'état de référence des parties est dans `state`. Les trames complètes sont
+# construites depuis les tableaux (positions) ; les PaddleState et BallState
+# ne sont recopiés (sync) que pour les parties qui perdent un point, ont des
+# contrôleurs, diffusent en mode "events" ou sont lues hors de la boucle
+# (snapshot, pause). `dirty` marque les lignes avancées depuis leur dernière
+# recopie.
+class VectorPhysics:
+    def __init__(self, capacity=64):
+        self.state = np.zeros((capacity, FIELDS))
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.games = []
+        self.rows = {}
+        self.queued = []
+
+    def __len__(self):
+        return len(self.games)
+
+    def add(self, game):
+        if game.game_id in self.rows:
+            return
+        row = len(self.games)
+        if row == len(self.state):
+            self.state = np.concatenate([self.state, np.zeros_like(self.state)])
+            self.dirty = np.concatenate([self.dirty, np.zeros_like(self.dirty)])
+        self.games.append(game)
+        self.rows[game.game_id] = row
+        game.physics = self
+        self.load(game)
+
+    def remove(self, game):
+        if game.game_id not in self.rows:
+            return
+        self.sync([game])
+        row = self.rows.pop(game.game_id)
+        last = len(self.games) - 1
+        if row != last:
+            moved = self.games[last]
+            self.games[row] = moved
+            self.rows[moved.game_id] = row
+            self.state[row] = self.state[last]
+            self.dirty[row] = self.dirty[last]
+        self.games.pop()
+        game.physics = None
+
+    def load(self, game):
+        ball, p1, p2 = game.ball_state, game.players['player1'], game.players['player2']
+        row = self.rows[game.game_id]
+        self.dirty[row] = False
+        self.state[row] = (
+            ball.x, ball.y, ball.dx, ball.dy,
+            p1.y, p1.dy, p2.y, p2.dy,
+            p1.lifepoints, p2.lifepoints,
+            game.step_scale,
+        )
+
+    def set_paddle_dy(self, game, player_id, dy):
+        row = self.rows.get(game.game_id)
+        if row is not None:
+            self.state[row, P1DY if player_id == 'player1' else P2DY] = dy
+
+    def queue(self, game):
+        self.queued.append(self.rows[game.game_id])
+
+    def flush(self):
+        if not self.queued:
+            return
+        rows = np.array(self.queued)
+        self.queued = []
+        scored, lost = self.step(rows)
+        self.dirty[rows] = True
+        # Point perdu : les lifepoints sont relus par Game.update_game_state
+        lost_rows = rows[lost]
+        if len(lost_rows):
+            self.write_back(lost_rows, lifepoints=True)
+            for row in rows[scored].tolist():
+                game = self.games[row]
+                game.reset_pos()
+                self.load(game)
+
+    def sync(self, games):
+        rows = [row for row in (self.rows.get(game.game_id) for game in games) if row is not None]
+        if not rows:
+            return
+        rows = np.array(rows)
+        rows = rows[self.dirty[rows]]
+        if len(rows):
+            self.write_back(rows)
+
+    def step(self, rows):
+        s = self.state[rows]
+        x, y, dx, dy = s[:, BX], s[:, BY], s[:, BDX], s[:, BDY]
+        scale = s[:, SCALE]
+        r = BALL_RADIUS
+
+        x += dx * scale
+        y += dy * scale
+        for col in (P1Y, P2Y):
+            s[:, col] += s[:, col + 1] * scale
+            s[:, col] = np.where(s[:, col] < 0, 0, s[:, col])
+            s[:, col] = np.where(s[:, col] + PADDLE_SIZE > CANVAS_HEIGHT, CANVAS_HEIGHT - PADDLE_SIZE, s[:, col])
+        p1y, p2y = s[:, P1Y], s[:, P2Y]
+
+        # Collision avec la raquette du joueur 1
+        hit = (x - r < P1_X + PADDLE_WIDTH) & (y - r <= p1y + PADDLE_SIZE) & (y + r >= p1y)
+        if hit.any():
+            x[hit] += (P1_X + PADDLE_WIDTH) - ((x[hit] - r) - (P1_X + PADDLE_WIDTH))
+            dx[hit] = _absadd(dx[hit], 1)
+            dy[hit] = _paddle_bounce(y[hit], p1y[hit], dx[hit])
+            dx[hit] *= -1
+
+        # Collision avec la raquette du joueur 2
+        hit = (x + r > P2_X) & (y - r <= p2y + PADDLE_SIZE) & (y + r >= p2y)
+        if hit.any():
+            x[hit] -= (x[hit] + r) - P2_X
+            dx[hit] = _absadd(dx[hit], 1)
+            dy[hit] = _paddle_bounce(y[hit], p2y[hit], dx[hit])
+            dx[hit] *= -1
+
+        scored1 = x < r
+        scored2 = x + r >= CANVAS_WIDTH
+        s[scored1, P1LP] -= 1
+        s[scored2, P2LP] -= 1
+        lost = scored1 | scored2
+        scored = (scored1 & (s[:, P1LP] > 0)) | (scored2 & (s[:, P2LP] > 0))
+
+        # Les parties remises au centre n'ont pas de rebond sur les bords
+        bottom = ~scored & (y + r > CANVAS_HEIGHT)
+        y[bottom] -= (y[bottom] + r) - CANVAS_HEIGHT
+        dy[bottom] *= -1
+        top = ~scored & (y - r < 0)
+        y[top] = np.abs(y[top] - r)
+        dy[top] *= -1
+
+        self.state[rows] = s
+        return scored, lost
+
+    # (x, y, dx, dy de la balle, y des raquettes) par game_id, pour
+    # Game.position_message, sans toucher aux objets d'état
+    def positions(self, games):
+        rows = [row for row in (self.rows.get(game.game_id) for game in games) if row is not None]
+        if not rows:
+            return {}
+        state = self.state[np.array(rows)]
+        xs, ys, p1ys, p2ys = state[:, (BX, BY, P1Y, P2Y)].T.tolist()
+        dxs, dys = state[:, (BDX, BDY)].T.astype(int).tolist()
+        game_ids = [self.games[row].game_id for row in rows]
+        return dict(zip(game_ids, zip(xs, ys, dxs, dys, p1ys, p2ys)))
+
+    # Recopie par colonnes (tolist par ligne coûte plus que la physique).
+    # Les lifepoints ne changent que sur un point perdu, recopié par flush.
+    def write_back(self, rows, lifepoints=False):
+        self.dirty[rows] = False
+        state = self.state[rows]
+        games = [self.games[row] for row in rows.tolist()]
+        xs, ys, p1ys, p2ys = state[:, (BX, BY, P1Y, P2Y)].T.tolist()
+        dxs, dys = state[:, (BDX, BDY)].T.astype(int).tolist()
+        for game, x, y, dx, dy, p1y, p2y in zip(games, xs, ys, dxs, dys, p1ys, p2ys):
+            ball, players = game.ball_state, game.players
+            ball.x, ball.y, ball.dx, ball.dy = x, y, dx, dy
+            players['player1'].y = p1y
+            players['player2'].y = p2y
+        if lifepoints:
+            lp1s, lp2s = state[:, (P1LP, P2LP)].T.astype(int).tolist()
+            for game, lp1, lp2 in zip(games, lp1s, lp2s):
+                game.players['player1'].lifepoints = lp1
+                game.players['player2'].lifepoints = lp2
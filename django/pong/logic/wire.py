@@ -0,0 +1,98 @@
+import struct
+
+# Protocole binaire de /ws/game/<id>/ (?proto=bin), little-endian.
+#
+# Serveur -> client, trames de position (57 octets) :
+#   u8 type, u32 tick, f64 ts (ms), u16 rate (Hz),
+#   f32 ball x, y, dx, dy,
+#   f32 player1 x, y, dy, u8 player1 lifepoints,
+#   f32 player2 x, y, dy, u8 player2 lifepoints
+# Trames d'évènement :
+#   ball_update   : u8 type, u32 tick, f32 x, y, dx, dy
+#   paddle_update : u8 type, u32 tick, u8 joueur, f32 x, y, dy
+# Les autres messages (waiting, game_over) restent en JSON texte.
+#
+# Client -> serveur, un octet : opcode de l'action | (joueur << 4),
+# joueur = 0 (celui de la connexion), 1 ou 2 (mode local).
+
+POSITION_UPDATE = 1
+FREEZE = 2
+BALL_UPDATE = 3
+PADDLE_UPDATE = 4
+KEYFRAME = 5
+
+POSITION_FRAME = struct.Struct("<BIdH4f3fB3fB")
+BALL_FRAME = struct.Struct("<BI4f")
+PADDLE_FRAME = struct.Struct("<BIB3f")
+
+FRAME_TYPES = {
+    "position_update": POSITION_UPDATE,
+    "freeze": FREEZE,
+    "ball_update": BALL_UPDATE,
+    "paddle_update": PADDLE_UPDATE,
+}
+
+ACTIONS = ["move_up", "move_down", "stop_move_up", "stop_move_down", "pause_game"]
+ACTION_OPCODES = {action: opcode for opcode, action in enumerate(ACTIONS, start=1)}
+PLAYERS = [None, "player1", "player2"]
+
+
+def is_binary_frame(message):
+    return message["type"] in FRAME_TYPES
+
+
+def encode_frame(message):
+    frame_type = FRAME_TYPES[message["type"]]
+    tick = message.get("tick", 0)
+    if frame_type == BALL_UPDATE:
+        ball = message["ball_position"]
+        return BALL_FRAME.pack(frame_type, tick, ball["x"], ball["y"], ball["dx"], ball["dy"])
+    if frame_type == PADDLE_UPDATE:
+        state = message["state"]
+        return PADDLE_FRAME.pack(frame_type, tick, PLAYERS.index(message["player"]), state["x"], state["y"], state["dy"])
+    if message.get("keyframe"):
+        frame_type = KEYFRAME
+    ball, p1, p2 = message["ball_position"], message["player1_state"], message["player2_state"]
+    return POSITION_FRAME.pack(
+        frame_type, tick, message.get("ts", 0), round(message.get("rate", 0)),
+        ball["x"], ball["y"], ball["dx"], ball["dy"],
+        p1["x"], p1["y"], p1.get("dy", 0), p1["lifepoints"],
+        p2["x"], p2["y"], p2.get("dy", 0), p2["lifepoints"],
+    )
+
+
+def decode_frame(data):
+    frame_type = data[0]
+    if frame_type == BALL_UPDATE:
+        _, tick, x, y, dx, dy = BALL_FRAME.unpack(data)
+        return {"type": "ball_update", "tick": tick, "ball_position": {"x": x, "y": y, "dx": dx, "dy": dy}}
+    if frame_type == PADDLE_UPDATE:
+        _, tick, player, x, y, dy = PADDLE_FRAME.unpack(data)
+        return {"type": "paddle_update", "tick": tick, "player": PLAYERS[player], "state": {"x": x, "y": y, "dy": dy}}
+    (_, tick, ts, rate, bx, by, bdx, bdy,
+     p1x, p1y, p1dy, p1lp, p2x, p2y, p2dy, p2lp) = POSITION_FRAME.unpack(data)
+    message = {
+        "type": "freeze" if frame_type == FREEZE else "position_update",
+        "tick": tick,
+        "ts": ts,
+        "rate": rate,
+        "ball_position": {"x": bx, "y": by, "dx": bdx, "dy": bdy},
+        "player1_state": {"x": p1x, "y": p1y, "dy": p1dy, "lifepoints": p1lp},
+        "player2_state": {"x": p2x, "y": p2y, "dy": p2dy, "lifepoints": p2lp},
+    }
+    if frame_type == KEYFRAME:
+        message["keyframe"] = True
+    return message
+
+
+def encode_action(action, player=None):
+    return bytes([ACTION_OPCODES[action] | (PLAYERS.index(player) << 4)])
+
+
+def decode_action(data):
+    if len(data) != 1:
+        return None, None
+    opcode, player = data[0] & 0x0F, data[0] >> 4
+    if not 1 <= opcode <= len(ACTIONS) or player >= len(PLAYERS):
+        return None, None
+    return ACTIONS[opcode - 1], PLAYERS[player]
@@ -0,0 +1,31 @@
+import uuid
+from django.conf import settings
+
+# Parties réparties entre PONG_GAME_WORKERS processus daphne : le worker k
+# écoute sur le port 8000 + k (le worker 0 est le processus principal, qui garde
+# matchmaking, chat et HTTP). Le worker propriétaire d'une partie est le
+# dernier chiffre hexadécimal de son game_id, que nginx lit pour router
+# /ws/game/<game_id>/.
+MAX_WORKERS = 16
+
+
+def worker_count():
+    return max(1, min(getattr(settings, 'PONG_GAME_WORKERS', 1), MAX_WORKERS))
+
+
+def current_worker():
+    return getattr(settings, 'PONG_WORKER_INDEX', 0)
+
+
+def new_game_id(worker, prefix=""):
+    game_id = prefix + str(uuid.uuid4())[len(prefix):]
+    return game_id[:-1] + format(worker % worker_count(), 'x')
+
+
+def owner(game_id):
+    return int(game_id[-1], 16) % worker_count()
+
+
+def owns(game_id):
+    return worker_count() == 1 or owner(game_id) == current_worker()
+
@@ -0,0 +1,62 @@
+import time
+from django.core.management.base import BaseCommand
+from pong.logic.ai_player import AIPlayer
+from pong.logic.simulation import HeadlessGame
+
+
+# Contrôleur chronométré : le surcoût de perf_counter (quelques dizaines de
+# ns par appel) est compté avec l'IA, l'estimation est donc pessimiste
+class TimedController:
+    def __init__(self, controller):
+        self.controller = controller
+        self.elapsed = 0.0
+        self.calls = 0
+
+    def __call__(self, game):
+        start = time.perf_counter()
+        velocity = self.controller(game)
+        self.elapsed += time.perf_counter() - start
+        self.calls += 1
+        return velocity
+
+
+class Command(BaseCommand):
+    help = "Coût de l'IA appelée par la partie à chaque tick (ou tous les N ticks) : temps par bot et par tick, bots tenus par cœur à 60 Hz."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=200)
+        parser.add_argument("--ticks", type=int, default=3000)
+        parser.add_argument("--every", type=int, nargs="+", default=[1, 4])
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        count, ticks = options["games"], options["ticks"]
+        for every in options["every"]:
+            games, timers = [], []
+            for index in range(count):
+                game = HeadlessGame(options["seed"] + index)
+                game.running = True
+                game.reset_pos()
+                timer = TimedController(AIPlayer("player2"))
+                game.attach_controller("player2", timer, every)
+                games.append(game)
+                timers.append(timer)
+
+            steps = 0
+            start = time.perf_counter()
+            for _ in range(ticks):
+                for game in games:
+                    if game.running:
+                        game.step()
+                        steps += 1
+            elapsed = time.perf_counter() - start
+
+            ai_time = sum(timer.elapsed for timer in timers)
+            calls = sum(timer.calls for timer in timers)
+            per_tick = ai_time / steps
+            wins = sum(game.winner() == "player2" for game in games)
+            self.stdout.write(
+                f"IA tous les {every} tick(s) : {ai_time / calls * 1e6:.2f} µs par appel, "
+                f"{per_tick * 1e6:.2f} µs par bot et par tick ({ai_time / elapsed:.0%} du temps des parties), "
+                f"~{1 / (per_tick * 60):,.0f} bots par cœur à 60 Hz ; l'IA gagne {wins}/{count} parties"
+            )
@@ -0,0 +1,51 @@
+import asyncio
+import json
+import time
+from django.core.management.base import BaseCommand
+from channels.layers import InMemoryChannelLayer
+from pong.logic.game import Game
+
+
+class Command(BaseCommand):
+    help = "Temps de sérialisation par tick : un json.dumps par destinataire (avant) contre une sérialisation par partie (après)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--receivers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+        parser.add_argument("--ticks", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        for receivers in options["receivers"]:
+            game = Game("bench", "bench")
+            game.channel_layer = InMemoryChannelLayer(capacity=options["ticks"] + 1)
+            channels = [await game.channel_layer.new_channel() for _ in range(receivers)]
+            for channel in channels:
+                await game.channel_layer.group_add(game.game_id, channel)
+
+            # Avant : le dict part tel quel et chaque consommateur fait son json.dumps
+            before = 0.0
+            for _ in range(options["ticks"]):
+                await game.channel_layer.group_send(game.game_id, {"type": "game_update", "message": game.position_message()})
+                for channel in channels:
+                    event = await game.channel_layer.receive(channel)
+                    start = time.perf_counter()
+                    json.dumps(event["message"])
+                    before += time.perf_counter() - start
+
+            # Après : Game.broadcast sérialise une fois, les consommateurs renvoient le texte
+            game.serialize_time = 0.0
+            game.json_receivers = receivers
+            for _ in range(options["ticks"]):
+                await game.broadcast(game.position_message())
+                for channel in channels:
+                    event = await game.channel_layer.receive(channel)
+                    assert event["text"]
+            after = game.serialize_time
+
+            ticks = options["ticks"]
+            self.stdout.write(
+                f"{receivers:>3} destinataires : avant {before / ticks * 1e6:6.2f} µs/tick, "
+                f"après {after / ticks * 1e6:6.2f} µs/tick"
+            )
@@ -0,0 +1,124 @@
+import asyncio
+import statistics
+import time
+import tracemalloc
+from channels.layers import get_channel_layer
+from django.core.management.base import BaseCommand
+from pong.logic.ai_player import AIPlayer
+from pong.logic.ai_pool import AIPool
+from pong.logic.game import Game, BASE_TICK_RATE
+from pong.logic.game_loop import GameLoop
+
+# Période de la sonde de retard de la boucle asyncio (secondes)
+PROBE_INTERVAL = 0.01
+
+
+# Partie IA contre IA sans base de données : le résultat n'est pas enregistré
+def ai_game(game_id, ai_pool, broadcast_mode):
+    game = Game(game_id, "ai1", "ai2")
+    game.ignore_match_act = True
+    game.broadcast_mode = broadcast_mode
+    # Le lecteur de la partie, client JSON
+    game.add_receiver(False)
+    for player_id in ("player1", "player2"):
+        ai = AIPlayer(player_id)
+        if ai_pool is not None:
+            ai_pool.register(ai)
+        game.attach_controller(player_id, ai)
+    return game
+
+
+class Command(BaseCommand):
+    help = "Capacité d'un worker : N parties IA contre IA dans la GameLoop, diffusées sur la channel layer locale (ticks/s, frames en retard, retard de la boucle, mémoire par partie, messages)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, nargs="+", default=[10, 100, 500])
+        parser.add_argument("--duration", type=float, default=10)
+        parser.add_argument("--physics", choices=["python", "numpy"], default="python")
+        parser.add_argument("--mode", choices=["full", "events"], default="full")
+        parser.add_argument("--ai-workers", type=int, default=0, help="processus de l'AIPool (0 : décisions dans la boucle)")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"channel layer : {type(get_channel_layer()).__name__}, physique {options['physics']}, "
+                          f"diffusion {options['mode']}, AIPool {options['ai_workers']} processus")
+        for count in options["games"]:
+            asyncio.run(self.run(count, options))
+
+    async def run(self, count, options):
+        layer = get_channel_layer()
+        physics = None
+        if options["physics"] == "numpy":
+            from pong.logic.vector_physics import VectorPhysics
+            physics = VectorPhysics()
+        ai_pool = AIPool(workers=options["ai_workers"], max_bots=2 * count) if options["ai_workers"] else None
+        games = {}
+        game_loop = GameLoop(games, rate=BASE_TICK_RATE, physics=physics, ai_pool=ai_pool)
+
+        # Un lecteur par partie, comme un PongConsumer abonné au groupe
+        received = 0
+
+        async def reader(game_id):
+            nonlocal received
+            channel = await layer.new_channel()
+            await layer.group_add(game_id, channel)
+            while True:
+                await layer.receive(channel)
+                received += 1
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        readers = []
+        for index in range(count):
+            game = ai_game(f"bench{index}", ai_pool, options["mode"])
+            games[game.game_id] = game
+            readers.append(asyncio.create_task(reader(game.game_id)))
+            game.start()
+            game_loop.add(game)
+        await asyncio.sleep(0)
+        memory = (tracemalloc.get_traced_memory()[0] - before) / count
+        tracemalloc.stop()
+
+        # Compte à rebours de départ (3 s), puis mesure
+        await asyncio.sleep(3.5)
+        lags = []
+        running = True
+
+        async def probe():
+            loop = asyncio.get_running_loop()
+            while running:
+                start = loop.time()
+                await asyncio.sleep(PROBE_INTERVAL)
+                lags.append(loop.time() - start - PROBE_INTERVAL)
+
+        stats = game_loop.stats()
+        ticks = sum(game.tick for game in games.values())
+        messages, received_before = stats["serialized_messages"], received
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.sleep(options["duration"])
+        elapsed = time.perf_counter() - start
+        running = False
+        await probe_task
+
+        after = game_loop.stats()
+        frames = after["frames"] - stats["frames"]
+        late = after["late_frames"] - stats["late_frames"]
+        ticks = sum(game.tick for game in games.values()) - ticks
+        lags.sort()
+        self.stdout.write(
+            f"{count:>5} parties : {ticks / elapsed:>9,.0f} ticks/s ({ticks / elapsed / count:.1f} par partie), "
+            f"{late}/{frames} frames en retard ({late / frames if frames else 0:.1%}), "
+            f"retard boucle p50 {statistics.median(lags) * 1000:.1f} ms / p99 {lags[int(len(lags) * 0.99)] * 1000:.1f} ms / max {lags[-1] * 1000:.1f} ms, "
+            f"{memory / 1024:.1f} Kio par partie, "
+            f"{(after['serialized_messages'] - messages) / elapsed:,.0f} messages/s envoyés, "
+            f"{(received - received_before) / elapsed:,.0f} reçus"
+        )
+
+        game_loop.stop()
+        for task in readers:
+            task.cancel()
+        for game in games.values():
+            game.stop()
+        await asyncio.gather(*readers, return_exceptions=True)
+        if ai_pool is not None:
+            ai_pool.close()
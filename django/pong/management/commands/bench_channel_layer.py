@@ -0,0 +1,63 @@
+import asyncio
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from channels.layers import InMemoryChannelLayer
+from pong.layers import UnixSocketChannelLayer
+
+
+async def throughput(sender, receiver, messages, payload):
+    channel = await receiver.new_channel()
+    await receiver.group_add("bench", channel)
+    # Laisse le temps à l'annonce du groupe d'arriver chez l'émetteur
+    await asyncio.sleep(0.05)
+
+    async def consume():
+        for _ in range(messages):
+            await receiver.receive(channel)
+
+    start = time.perf_counter()
+    consumer = asyncio.create_task(consume())
+    for _ in range(messages):
+        await sender.group_send("bench", payload)
+        # Reste sous la capacité du channel
+        await asyncio.sleep(0)
+    await consumer
+    elapsed = time.perf_counter() - start
+    await receiver.group_discard("bench", channel)
+    return messages / elapsed
+
+
+class Command(BaseCommand):
+    help = "Débit de group_send : InMemoryChannelLayer contre UnixSocketChannelLayer (même nœud et entre deux nœuds)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options["messages"]))
+
+    async def run(self, messages):
+        payload = {
+            "type": "game_update",
+            "message_type": "position_update",
+            "text": "x" * 300,
+        }
+        memory = InMemoryChannelLayer()
+        self.stdout.write(f"InMemoryChannelLayer          : {await throughput(memory, memory, messages, payload):9,.0f} msg/s")
+
+        with tempfile.TemporaryDirectory() as path:
+            first = UnixSocketChannelLayer(path=path)
+            second = UnixSocketChannelLayer(path=path)
+            await first.start()
+            await second.start()
+            self.stdout.write(f"UnixSocketChannelLayer (local): {await throughput(first, first, messages, payload):9,.0f} msg/s")
+            self.stdout.write(f"UnixSocketChannelLayer (relai): {await throughput(first, second, messages, payload):9,.0f} msg/s")
+
+            # Send direct vers un channel de l'autre nœud, bytes compris
+            channel = await second.new_channel()
+            await first.send(channel, payload)
+            received = await asyncio.wait_for(second.receive(channel), 1)
+            self.stdout.write(f"send entre nœuds : {'OK' if received == payload else 'ÉCHEC'}")
+            await first.close()
+            await second.close()
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import random
+import statistics
+import time
+from types import SimpleNamespace
+from django.core.management.base import BaseCommand
+from pong.logic.lobby import Lobby
+
+
+# Lobby sans base de données : les parties trouvées ne sont pas créées
+class BenchLobby(Lobby):
+    async def host_game(self, game_id, player1, player2=None):
+        return None
+
+
+class StubConsumer:
+    def __init__(self, user_id, ratio):
+        self.user = SimpleNamespace(id=user_id, username=f"bench{user_id}")
+        self.scope = {"user": self.user}
+        self.ratio = ratio
+        self.enqueued_at = time.time()
+        self.matched_at = None
+        self.statuses = 0
+
+    async def send(self, text_data):
+        message = json.loads(text_data)
+        if message["type"] == "game_found":
+            self.matched_at = time.time()
+        elif message["type"] == "queue_status":
+            self.statuses += 1
+
+
+# Même formule que LobbyConsumer.handle_find_game : wins / match_played, 0.5
+# pour un joueur sans partie
+def random_ratio(rng, new_players):
+    if rng.random() < new_players:
+        return 0.5
+    match_played = int(rng.expovariate(1 / 30)) + 1
+    skill = rng.betavariate(5, 5)
+    wins = sum(rng.random() < skill for _ in range(match_played))
+    return wins / match_played
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+class Command(BaseCommand):
+    help = "Charge simulée sur le matchmaking du Lobby (joueurs factices, sans base) : latences, temps des passages, écarts de ratio, débit."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rate", type=float, default=50, help="arrivées par seconde")
+        parser.add_argument("--peak", type=float, default=4, help="multiplicateur d'arrivées au pic (milieu de la simulation)")
+        parser.add_argument("--duration", type=float, default=30)
+        parser.add_argument("--patience", type=float, default=45, help="attente moyenne avant abandon (s)")
+        parser.add_argument("--new-players", type=float, default=0.2)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        rng = random.Random(options["seed"])
+        previous, Lobby._instance = Lobby._instance, None
+        lobby = BenchLobby()
+        matchmaker = lobby.matchmaker
+
+        pass_times = []
+        run_pass = matchmaker.run_pass
+
+        async def timed_pass():
+            start = time.perf_counter()
+            await run_pass()
+            pass_times.append(time.perf_counter() - start)
+        matchmaker.run_pass = timed_pass
+
+        players = []
+        quits = []
+        max_queue = 0
+
+        async def quit_later(player, delay):
+            await asyncio.sleep(delay)
+            if player in lobby.waiting_queue:
+                lobby.remove_player_from_queue(player)
+                quits.append(player)
+
+        duration = options["duration"]
+        start = time.time()
+        tasks = []
+        while (elapsed := time.time() - start) < duration:
+            # Pic d'arrivées en cloche au milieu de la simulation
+            peak = 1 + (options["peak"] - 1) * max(0.0, 1 - abs(elapsed / duration - 0.5) * 4)
+            player = StubConsumer(len(players), random_ratio(rng, options["new_players"]))
+            players.append(player)
+            lobby.add_player_to_queue(player, player.ratio)
+            tasks.append(asyncio.create_task(quit_later(player, rng.expovariate(1 / options["patience"]))))
+            max_queue = max(max_queue, len(lobby.waiting_queue))
+            await asyncio.sleep(rng.expovariate(options["rate"] * peak))
+        await asyncio.sleep(0.5)
+        for task in tasks:
+            task.cancel()
+        Lobby._instance = previous
+
+        matched = [player for player in players if player.matched_at is not None]
+        latencies = sorted(player.matched_at - player.enqueued_at for player in matched)
+        by_user = {player.user.username: player for player in players}
+        gaps = sorted(
+            abs(by_user[a].ratio - by_user[b].ratio)
+            for a, b in self.pairs(matched)
+        )
+        pass_times.sort()
+
+        self.stdout.write(f"{len(players)} joueurs en {duration:.0f} s, file max {max_queue}, "
+                          f"{len(matched) // 2} parties, {len(quits)} abandons, {len(lobby.waiting_queue)} encore en file")
+        self.stdout.write(f"débit : {len(matched) / 2 / duration:.1f} parties/s")
+        self.stdout.write("latence (ms) : " + ", ".join(
+            f"p{int(q * 100)} {percentile(latencies, q) * 1000:.1f}" for q in (0.5, 0.9, 0.99)
+        ) + f", max {latencies[-1] * 1000 if latencies else 0:.1f}")
+        self.stdout.write(f"passages : {len(pass_times)}, total {sum(pass_times) * 1000:.1f} ms, "
+                          f"p99 {percentile(pass_times, 0.99) * 1000:.2f} ms, max {pass_times[-1] * 1000 if pass_times else 0:.2f} ms")
+        if gaps:
+            self.stdout.write(
+                f"écart de ratio : médiane {statistics.median(gaps):.3f}, p90 {percentile(gaps, 0.9):.3f}, max {gaps[-1]:.3f} ; "
+                f"<= 0.1 : {sum(g <= 0.1 for g in gaps)}, <= 0.2 : {sum(0.1 < g <= 0.2 for g in gaps)}, au-delà : {sum(g > 0.2 for g in gaps)}"
+            )
+        self.stdout.write(f"notifications de file : {sum(player.statuses for player in players)}")
+
+    # Deux joueurs appariés reçoivent game_found au même instant
+    def pairs(self, matched):
+        matched = sorted(matched, key=lambda player: player.matched_at)
+        for first, second in zip(matched[::2], matched[1::2]):
+            yield first.user.username, second.user.username
@@ -0,0 +1,67 @@
+import asyncio
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from pong.logic.matchmaking import MatchmakingQueue, Matchmaker
+
+
+class FakePlayer:
+    async def send(self, message):
+        pass
+
+
+async def measure(options, polling):
+    rng = random.Random(options["seed"])
+    queue = MatchmakingQueue()
+    latencies = []
+
+    async def start_game(player1, player2):
+        now = time.time()
+        for player in (player1, player2):
+            latencies.append(now - queue.get(player)["timestamp"])
+        queue.remove(player1)
+        queue.remove(player2)
+
+    async def notify_status(player, status):
+        await player.send(status)
+
+    matchmaker = Matchmaker(queue, start_game, notify_status)
+    if polling:
+        # Ancien fonctionnement : un passage par seconde
+        async def poll():
+            while True:
+                await matchmaker.run_pass()
+                await asyncio.sleep(1)
+        task = asyncio.create_task(poll())
+    else:
+        task = asyncio.create_task(matchmaker.run())
+
+    interval = 1 / options["rate"]
+    for _ in range(int(options["rate"] * options["duration"])):
+        queue.add(FakePlayer(), round(rng.random(), 2), time.time())
+        if not polling:
+            matchmaker.wake()
+        await asyncio.sleep(rng.expovariate(1 / interval))
+    await asyncio.sleep(1.5)
+    task.cancel()
+    return latencies, len(queue), matchmaker.passes, matchmaker.notifications
+
+
+class Command(BaseCommand):
+    help = "Délai entre l'entrée en file et l'appariement : passage chaque seconde contre matchmaking sur évènements."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rate", type=float, default=200, help="joueurs par seconde")
+        parser.add_argument("--duration", type=float, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        for label, polling in (("chaque seconde", True), ("évènements", False)):
+            latencies, left, passes, notifications = asyncio.run(measure(options, polling))
+            latencies.sort()
+            self.stdout.write(
+                f"{label:>15} : {len(latencies)} appariés, médiane {statistics.median(latencies) * 1000:7.1f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:7.1f} ms, "
+                f"{passes} passages, {notifications} notifications, {left} encore en file"
+            )
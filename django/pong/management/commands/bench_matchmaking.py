@@ -0,0 +1,91 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from pong.logic.matchmaking import MatchmakingQueue, within_window
+
+
+# Ancien passage : toutes les paires, comme Lobby.matchmaking avant l'index
+def legacy_pass(queue, current_time):
+    pairs = []
+    for player1 in list(queue):
+        if player1 not in queue:
+            continue
+        ratio1, timestamp1 = queue[player1]["ratio"], queue[player1]["timestamp"]
+        best_match = None
+        best_match_time = float('inf')
+        for player2, data2 in queue.items():
+            if player1 == player2:
+                continue
+            if within_window(current_time - timestamp1, abs(ratio1 - data2["ratio"])):
+                if data2["timestamp"] < best_match_time:
+                    best_match = player2
+                    best_match_time = data2["timestamp"]
+        if best_match:
+            pairs.append((player1, best_match))
+            del queue[player1]
+            del queue[best_match]
+    return pairs
+
+
+# Ancien ajout : comparaison du nom d'utilisateur avec toute la file
+def legacy_add(queue, consumer, ratio, timestamp):
+    for existing_consumer in queue.keys():
+        if existing_consumer == consumer:
+            return
+    queue[consumer] = {"ratio": ratio, "timestamp": timestamp}
+
+
+def indexed_pass(queue, current_time):
+    pairs = []
+    for player1, best_match in queue.pairs(current_time):
+        if best_match:
+            pairs.append((player1, best_match))
+            queue.remove(player1)
+            queue.remove(best_match)
+    return pairs
+
+
+def random_players(count, rng, now):
+    # Arrivées réparties sur les 30 dernières secondes, dans l'ordre
+    timestamps = sorted(now - rng.uniform(0, 30) for _ in range(count))
+    return [(f"p{i}", round(rng.random(), 3), timestamps[i]) for i in range(count)]
+
+
+class Command(BaseCommand):
+    help = "Durée d'un passage de matchmaking : parcours de toutes les paires contre file indexée par ratio."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+        parser.add_argument("--legacy-max", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        for count in options["players"]:
+            rng = random.Random(options["seed"])
+            now = time.time()
+            players = random_players(count, rng, now)
+
+            queue = MatchmakingQueue()
+            start = time.perf_counter()
+            for name, ratio, timestamp in players:
+                queue.add(name, ratio, timestamp, user_id=name)
+            add_time = time.perf_counter() - start
+            start = time.perf_counter()
+            indexed = indexed_pass(queue, now)
+            indexed_time = time.perf_counter() - start
+            line = (f"{count:>7} joueurs : ajouts {add_time * 1000:8.2f} ms, "
+                    f"passage index {indexed_time * 1000:9.2f} ms ({len(indexed)} paires)")
+
+            if count <= options["legacy_max"]:
+                legacy_queue = {}
+                start = time.perf_counter()
+                for name, ratio, timestamp in players:
+                    legacy_add(legacy_queue, name, ratio, timestamp)
+                legacy_add_time = time.perf_counter() - start
+                start = time.perf_counter()
+                legacy = legacy_pass(legacy_queue, now)
+                legacy_time = time.perf_counter() - start
+                same = "identiques" if legacy == indexed else "DIFFÉRENTES"
+                line += (f" | avant : ajouts {legacy_add_time * 1000:8.2f} ms, "
+                         f"toutes les paires {legacy_time * 1000:9.2f} ms, appariements {same}")
+            self.stdout.write(line)
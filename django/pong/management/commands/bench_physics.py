@@ -0,0 +1,112 @@
+import asyncio
+import random
+import time
+import numpy as np
+from django.core.management.base import BaseCommand
+from pong.logic.game import Game, CANVAS_HEIGHT, CANVAS_WIDTH, PADDLE_SIZE, PLAYER_SPEED
+from pong.logic.vector_physics import VectorPhysics
+
+
+def random_game(game_id, rng):
+    game = Game(game_id, "bench")
+    game.ball_state.x = rng.uniform(20, CANVAS_WIDTH - 20)
+    game.ball_state.y = rng.uniform(10, CANVAS_HEIGHT - 10)
+    game.ball_state.dx = rng.choice([-1, 1]) * rng.randint(5, 20)
+    game.ball_state.dy = rng.randint(-20, 20)
+    for player_id in ("player1", "player2"):
+        game.players[player_id].y = rng.uniform(0, CANVAS_HEIGHT - PADDLE_SIZE)
+        game.players[player_id].dy = rng.choice([-PLAYER_SPEED, 0, PLAYER_SPEED])
+    return game
+
+
+def random_inputs(games, rng):
+    actions = []
+    for index in range(len(games)):
+        if rng.random() < 0.05:
+            actions.append((index, rng.choice(["player1", "player2"]), rng.choice(["move_up", "move_down", "stop_move_up", "stop_move_down"])))
+    return actions
+
+
+class Command(BaseCommand):
+    help = "Compare le moteur VectorPhysics à Game.ball_updater (résultats et temps par partie), avec et sans la construction des trames position_update des parties envoyées."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, nargs="+", default=[10, 100, 1000, 10000])
+        parser.add_argument("--ticks", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--send-every", type=int, default=1, help="ticks entre deux envois d'une partie")
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        # reset_pos lance un compte à rebours : il faut une boucle active
+        for count in options["games"]:
+            rng = random.Random(options["seed"])
+            reference = [random_game(f"ref{i}", rng) for i in range(count)]
+            rng = random.Random(options["seed"])
+            vector = [random_game(f"vec{i}", rng) for i in range(count)]
+            physics = VectorPhysics()
+            for game in vector:
+                physics.add(game)
+
+            python_time = vector_time = python_send = vector_send = 0.0
+            mismatches = 0
+            send_every = options["send_every"]
+            for tick in range(options["ticks"]):
+                for index, player_id, action in random_inputs(reference, rng):
+                    reference[index].handle_player_action(player_id, action)
+                    vector[index].handle_player_action(player_id, action)
+
+                state = random.getstate()
+                start = time.perf_counter()
+                for game in reference:
+                    game.ball_updater()
+                middle = time.perf_counter()
+                for index, game in enumerate(reference):
+                    if (tick + index) % send_every == 0:
+                        game.position_message()
+                python_time += middle - start
+                python_send += time.perf_counter() - middle
+
+                random.setstate(state)
+                start = time.perf_counter()
+                for game in vector:
+                    physics.queue(game)
+                physics.flush()
+                middle = time.perf_counter()
+                sending = [game for index, game in enumerate(vector) if (tick + index) % send_every == 0]
+                positions = physics.positions(sending)
+                for game in sending:
+                    game.position_message(positions[game.game_id])
+                vector_time += middle - start
+                vector_send += time.perf_counter() - middle
+
+                for ref, vec in zip(reference, vector):
+                    if ref.snapshot() != vec.snapshot():
+                        mismatches += 1
+                        for field in ("x", "y", "dx", "dy"):
+                            setattr(vec.ball_state, field, getattr(ref.ball_state, field))
+                        for player_id in ("player1", "player2"):
+                            vec.players[player_id].y = ref.players[player_id].y
+                            vec.players[player_id].lifepoints = ref.players[player_id].lifepoints
+                        physics.load(vec)
+
+            rows = np.arange(count)
+            start = time.perf_counter()
+            for _ in range(options["ticks"]):
+                physics.step(rows)
+            step_time = time.perf_counter() - start
+
+            per_tick = options["ticks"] * count
+            self.stdout.write(
+                f"{count:>6} parties : ball_updater {python_time / per_tick * 1e6:6.2f} µs/partie "
+                f"({(python_time + python_send) / per_tick * 1e6:6.2f} avec trames), "
+                f"VectorPhysics {vector_time / per_tick * 1e6:6.2f} µs/partie "
+                f"({(vector_time + vector_send) / per_tick * 1e6:6.2f} avec trames, "
+                f"step seul {step_time / per_tick * 1e6:5.3f}), "
+                f"divergences {mismatches}"
+            )
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from pong.logic.game import CANVAS_WIDTH, CANVAS_HEIGHT, PADDLE_WIDTH, BALL_RADIUS, DEFAULT_PLAYER_TWO_STATE, absadd
+from pong.logic.prediction import predict, predict_batch, LEFT_LINE, RIGHT_LINE
+
+# Vitesses horizontales comparées (|dx|, bornes incluses)
+SPEED_BANDS = ((5, 9), (10, 19), (20, 40))
+
+
+# Ancienne estimation de l'IA : simulation pas à pas, 60 frames au plus
+def legacy_actualise_pos(pos):
+    pos['x'] += pos['dx']
+    if (pos['x'] - BALL_RADIUS <= PADDLE_WIDTH + (CANVAS_WIDTH // 100)):
+        pos['x'] += (PADDLE_WIDTH + (CANVAS_WIDTH // 100)) - (pos['x'] - BALL_RADIUS)
+        pos['dy'] = 0
+        pos['dx'] = absadd(pos['dx'], 1)
+        pos['dx'] *= -1
+    pos['y'] += pos['dy']
+    if (pos['y'] + BALL_RADIUS > CANVAS_HEIGHT):
+        pos['y'] -= (pos['y'] + BALL_RADIUS) - CANVAS_HEIGHT
+        pos['dy'] *= -1
+    elif (pos['y'] - BALL_RADIUS < 0):
+        pos['y'] += 0 - (pos['y'] - BALL_RADIUS)
+        pos['dy'] *= -1
+    return pos
+
+
+def legacy_estimate(x, y, dx, dy):
+    act_pos = {'x': x, 'y': y, 'dx': dx, 'dy': dy}
+    for frames in range(60):
+        act_pos = legacy_actualise_pos(act_pos)
+        if act_pos['x'] + BALL_RADIUS >= DEFAULT_PLAYER_TWO_STATE['x']:
+            return act_pos['y']
+        if frames >= 59 or act_pos['x'] - BALL_RADIUS <= (CANVAS_WIDTH // 100 ) + PADDLE_WIDTH:
+            return CANVAS_HEIGHT // 2
+
+
+# Référence : bords de Game.ball_updater, renvoi à plat du joueur 1, sans limite
+def reference(x, y, dx, dy):
+    while True:
+        x += dx
+        if x <= LEFT_LINE:
+            x, dx, dy = LEFT_LINE, -dx + 1, 0
+        y += dy
+        if y + BALL_RADIUS > CANVAS_HEIGHT:
+            y -= (y + BALL_RADIUS) - CANVAS_HEIGHT
+            dy *= -1
+        if y - BALL_RADIUS < 0:
+            y = abs(y - BALL_RADIUS)
+            dy *= -1
+        if x >= RIGHT_LINE:
+            return y
+
+
+def random_balls(count, rng, low, high):
+    return [
+        (
+            rng.uniform(LEFT_LINE + 1, RIGHT_LINE - 1),
+            rng.uniform(BALL_RADIUS, CANVAS_HEIGHT - BALL_RADIUS),
+            rng.choice((-1, 1)) * rng.randint(low, high),
+            rng.randint(-high, high),
+        )
+        for _ in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Prédiction de l'IA : simulation pas à pas (60 frames) contre calcul direct par dépliage, unitaire et par lot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--balls", type=int, default=20000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        count = options["balls"]
+
+        balls = random_balls(count, rng, SPEED_BANDS[0][0], SPEED_BANDS[-1][1])
+        for name, estimate in (("pas à pas", legacy_estimate), ("dépliage", lambda *ball: predict(*ball)[2])):
+            start = time.perf_counter()
+            for ball in balls:
+                estimate(*ball)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{name:>10} : {elapsed / count * 1e6:.2f} µs par décision")
+        columns = list(zip(*balls))
+        start = time.perf_counter()
+        predict_batch(*columns)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{'lot numpy':>10} : {elapsed / count * 1e6:.3f} µs par balle ({count} balles)")
+
+        self.stdout.write("erreur moyenne en y (px) face à la trajectoire de référence :")
+        for low, high in SPEED_BANDS:
+            balls = random_balls(count // 10, rng, low, high)
+            truth = [reference(*ball) for ball in balls]
+            legacy = statistics.mean(abs(legacy_estimate(*ball) - y) for ball, y in zip(balls, truth))
+            direct = statistics.mean(abs(predict(*ball)[2] - y) for ball, y in zip(balls, truth))
+            self.stdout.write(f"  |dx| {low:>2}-{high:<2} : pas à pas {legacy:6.1f}, dépliage {direct:6.1f}")
@@ -0,0 +1,47 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from pong.logic.simulation import simulate
+
+ACTIONS = ["move_up", "move_down", "stop_move_up", "stop_move_down"]
+
+
+def random_inputs(seed, ticks):
+    rng = random.Random(seed)
+    return [
+        (tick, rng.choice(["player1", "player2"]), rng.choice(ACTIONS))
+        for tick in range(1, ticks + 1)
+        if rng.random() < 0.05
+    ]
+
+
+class Command(BaseCommand):
+    help = "Simulations sans réseau : vitesse en ticks/s et déterminisme à graine égale."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=100)
+        parser.add_argument("--ticks", type=int, default=20000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--collision", choices=["discrete", "swept"], default=None)
+
+    def handle(self, *args, **options):
+        total_ticks = 0
+        winners = {"player1": 0, "player2": 0, None: 0}
+        start = time.perf_counter()
+        for index in range(options["games"]):
+            seed = options["seed"] + index
+            result = simulate(seed, random_inputs(seed, options["ticks"]), max_ticks=options["ticks"],
+                              collision_mode=options["collision"])
+            total_ticks += result["ticks"]
+            winners[result["winner"]] += 1
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{options['games']} parties, {total_ticks} ticks en {elapsed:.2f} s "
+                          f"({total_ticks / elapsed:,.0f} ticks/s, {total_ticks / elapsed / 60:,.0f}x temps réel par cœur)")
+        self.stdout.write(f"vainqueurs : player1 {winners['player1']}, player2 {winners['player2']}, aucun {winners[None]}")
+
+        seed = options["seed"]
+        inputs = random_inputs(seed, options["ticks"])
+        first = simulate(seed, inputs, max_ticks=options["ticks"], trace_every=1, collision_mode=options["collision"])
+        second = simulate(seed, inputs, max_ticks=options["ticks"], trace_every=1, collision_mode=options["collision"])
+        same = first["trace"] == second["trace"] and first["state"] == second["state"]
+        self.stdout.write(f"déterminisme (graine {seed}, {first['ticks']} ticks tracés) : {'OK' if same else 'ÉCHEC'}")
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import timeit
+import tracemalloc
+from django.core.management.base import BaseCommand
+from pong.logic.game import Game, DEFAULT_PLAYER_ONE_STATE, DEFAULT_PLAYER_TWO_STATE, DEFAULT_BALL_STATE
+from pong.logic.state import PaddleState, BallState
+
+
+# Ancien format de l'état d'une partie (dict de dicts), pour comparaison
+def legacy_state():
+    return {
+        "player1": {**DEFAULT_PLAYER_ONE_STATE, 'lifepoints': 5, 'disconnected': False, 'connected': False},
+        "player2": {**DEFAULT_PLAYER_TWO_STATE, 'lifepoints': 5, 'disconnected': False, 'connected': False},
+    }, DEFAULT_BALL_STATE.copy()
+
+
+def slotted_state():
+    return {
+        "player1": PaddleState(DEFAULT_PLAYER_ONE_STATE),
+        "player2": PaddleState(DEFAULT_PLAYER_TWO_STATE),
+    }, BallState(DEFAULT_BALL_STATE)
+
+
+def measure(factory, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return size / count
+
+
+class Command(BaseCommand):
+    help = "Mémoire par partie (état en dicts contre état slotté) et coût d'accès aux champs dans ball_updater."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=10000)
+        parser.add_argument("--ticks", type=int, default=200000)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        count = options["games"]
+        self.stdout.write(f"état dicts   : {measure(lambda i: legacy_state(), count):7.0f} octets/partie")
+        self.stdout.write(f"état slotté  : {measure(lambda i: slotted_state(), count):7.0f} octets/partie")
+        self.stdout.write(f"Game complet : {measure(lambda i: Game(f'bench{i}', 'bench'), count):7.0f} octets/partie")
+
+        legacy, legacy_ball = legacy_state()
+        players, ball = slotted_state()
+        number = 1000000
+        dict_read = timeit.timeit(lambda: (legacy_ball['x'], legacy_ball['dy'], legacy['player1']['y']), number=number)
+        slot_read = timeit.timeit(lambda: (ball.x, ball.dy, players['player1'].y), number=number)
+        self.stdout.write(f"lecture de 3 champs : dicts {dict_read / number * 1e9:5.0f} ns, slots {slot_read / number * 1e9:5.0f} ns")
+
+        # Balle qui rebondit entre les murs, sans jamais marquer
+        game = Game("bench", "bench")
+        game.ball_state.dx = 0
+        ticks = options["ticks"]
+        start = time.perf_counter()
+        for _ in range(ticks):
+            game.ball_updater()
+        self.stdout.write(f"ball_updater : {(time.perf_counter() - start) / ticks * 1e6:5.2f} µs/tick")
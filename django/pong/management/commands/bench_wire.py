@@ -0,0 +1,46 @@
+import json
+import random
+import time
+from django.core.management.base import BaseCommand
+from pong.logic import wire
+from pong.logic.game import Game
+
+
+class Command(BaseCommand):
+    help = "Compare le protocole JSON et le protocole binaire du socket de jeu (octets et CPU par trame)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--frames", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        game = Game("bench", "bench")
+        rng = random.Random(0)
+        messages = []
+        for _ in range(1000):
+            game.ball_state.reset({'x': rng.uniform(0, 800), 'y': rng.uniform(0, 400), 'dx': rng.randint(-15, 15), 'dy': rng.randint(-15, 15), 'radius': 5})
+            game.players['player1'].y = rng.uniform(0, 330)
+            game.players['player2'].y = rng.uniform(0, 330)
+            messages.append(game.position_message())
+
+        frames = options["frames"]
+        for name, encode, decode in (
+            ("json", json.dumps, json.loads),
+            ("binaire", wire.encode_frame, wire.decode_frame),
+        ):
+            encoded = [encode(messages[i % len(messages)]) for i in range(len(messages))]
+            size = sum(len(data) for data in encoded) / len(encoded)
+
+            start = time.perf_counter()
+            for i in range(frames):
+                encode(messages[i % len(messages)])
+            encode_time = (time.perf_counter() - start) / frames
+
+            start = time.perf_counter()
+            for i in range(frames):
+                decode(encoded[i % len(encoded)])
+            decode_time = (time.perf_counter() - start) / frames
+
+            self.stdout.write(
+                f"{name:>8} : {size:6.1f} octets/trame, encodage {encode_time * 1e6:5.2f} µs, "
+                f"décodage {decode_time * 1e6:5.2f} µs"
+            )
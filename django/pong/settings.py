@@ -167,6 +167,50 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Moteur physique des parties : 'python' (Game.ball_updater) ou 'numpy' (VectorPhysics)
+PONG_PHYSICS_BACKEND = os.getenv('PONG_PHYSICS_BACKEND', 'python')
+
+# Diffusion de l'état des parties : 'full' (position_update à chaque frame)
+# ou 'events' (rebonds, raquettes, points + une keyframe par seconde)
+PONG_BROADCAST_MODE = os.getenv('PONG_BROADCAST_MODE', 'full')
+
+# Fréquences par défaut des parties : simulation (et cadence de la boucle de
+# jeu) et envoi des positions aux clients, un diviseur de la simulation
+# (GameLoop.add refuse les autres)
+PONG_TICK_RATE = int(os.getenv('PONG_TICK_RATE') or '60')
+PONG_SEND_RATE = int(os.getenv('PONG_SEND_RATE') or PONG_TICK_RATE)
+
+# Collisions de la balle : 'discrete' (test de chevauchement après le
+# déplacement) ou 'swept' (instant d'impact exact, sûr aux faibles tick rates)
+PONG_COLLISION = os.getenv('PONG_COLLISION', 'discrete')
+
+# Durée de vie des parties (secondes) : délai pour que les deux joueurs se
+# connectent, puis délai avant de libérer une partie terminée. Le délai de
+# connexion vaut aussi pour les parties d'un autre worker jamais rejointes
+# (ligne SimpleMatch annulée par leur worker propriétaire).
+PONG_CONNECT_TIMEOUT = int(os.getenv('PONG_CONNECT_TIMEOUT') or '120')
+PONG_FINISHED_TTL = int(os.getenv('PONG_FINISHED_TTL') or '30')
+
+# IA des parties solo : processus de calcul des décisions (0 = dans la boucle
+# de jeu) et nombre maximal de bots par processus daphne
+PONG_AI_WORKERS = int(os.getenv('PONG_AI_WORKERS') or '1')
+PONG_MAX_AI_BOTS = int(os.getenv('PONG_MAX_AI_BOTS') or '200')
+
+# Processus daphne hébergeant les parties (voir pong/logic/workers.py et
+# entrypoint.sh) : nombre total et index de ce processus
+PONG_GAME_WORKERS = int(os.getenv('PONG_GAME_WORKERS') or '1')
+PONG_WORKER_INDEX = int(os.getenv('PONG_WORKER_INDEX') or '0')
+
+# Plusieurs processus : groupes et channels partagés via des sockets Unix
+# (pong/layers.py) au lieu de la couche en mémoire d'un seul processus
+if PONG_GAME_WORKERS > 1:
+    CHANNEL_LAYERS['default'] = {
+        'BACKEND': 'pong.layers.UnixSocketChannelLayer',
+        'CONFIG': {
+            'path': os.getenv('PONG_CHANNEL_SOCKETS', '/tmp/pong-channels'),
+        },
+    }
+
 CSRF_TRUSTED_ORIGINS = ["https://transcendence.dev"]
 CSRF_COOKIE_SECURE = True
 SESSION_COOKIE_SECURE = True
@@ -58,6 +58,7 @@ window.initChat = async () => {
 
     let ws = null;
     let blockedUsers = new Set();
+    let onlineUsers = [];
 
     async function checkAuthentication() {
         try {
@@ -139,8 +140,20 @@ window.initChat = async () => {
             myFriends.add(data.username)
         }
         if (data.users) {
-          updateUserList(data.users, data.blocked_users || []);
+          onlineUsers = data.users;
+          updateUserList(onlineUsers, data.blocked_users || []);
+        } else if (data.action === "added" || data.action === "removed") {
+          // Ami ajouté ou retiré : la séparation amis / autres change
+          updateUserList(onlineUsers);
         }
+      } else if (data.type === "user_online") {
+        if (!onlineUsers.some((user) => user.username === data.username)) {
+          onlineUsers.push({ username: data.username });
+          updateUserList(onlineUsers);
+        }
+      } else if (data.type === "user_offline") {
+        onlineUsers = onlineUsers.filter((user) => user.username !== data.username);
+        updateUserList(onlineUsers);
       } else if (data.type === "game_invitation") {
         showGameInvitation(data);
       } else if (data.type === "invitation_expired") {
@@ -448,6 +461,11 @@ window.initChat = async () => {
       link.innerText = "Vers le jeu Pong";
       link.target = "_blank";
       link.classList.add("spa-link");
+      link.addEventListener("click", () => {
+        if (ws && ws.readyState === WebSocket.OPEN) {
+          ws.send(JSON.stringify({ action: "accept_invitation", invite_id: inviteData.invite_id }));
+        }
+      });
 
       invitationDiv.appendChild(document.createElement("br")); //Saut de ligne
       invitationDiv.appendChild(link);
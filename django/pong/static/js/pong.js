@@ -15,6 +15,23 @@ window.initPong = function () {
   const player1 = { x: 0, y: 0, hp: 5 };
   const player2 = { x: 0, y: 0, hp: 5 };
 
+  // Rendu sur l'horloge de simulation du serveur (tick, rate) : interpolation
+  // entre deux snapshots en mode "full", extrapolation entre deux évènements
+  // en mode "events". Les vitesses sont en pixels par frame à 60 Hz.
+  const BASE_FPS = 60;
+  const PADDLE_HEIGHT = 70;
+  let clock = null;
+  let animationId = null;
+  let snapshots = [];
+  const motion = { ball: null, player1: null, player2: null };
+
+  // Protocole binaire du socket de jeu (voir pong/logic/wire.py), sur demande :
+  // ?proto=bin dans l'URL de la page, JSON par défaut. Lu à chaque partie.
+  let binaryProtocol = false;
+  const FRAME_TYPES = { 1: "position_update", 2: "freeze", 3: "ball_update", 4: "paddle_update", 5: "position_update" };
+  const ACTION_OPCODES = { move_up: 1, move_down: 2, stop_move_up: 3, stop_move_down: 4, pause_game: 5 };
+  const PLAYERS = [undefined, "player1", "player2"];
+
   function setupCanvas() {
     canvas = document.getElementById("pong");
     if (!canvas) {
@@ -44,6 +61,8 @@ window.initPong = function () {
               lobbySocket.close();
               role = data.role;
               connectToGame(data.game_id, data.role, data.mode);
+          } else if (data.type === "queue_status") {
+              displayWaitingMessage(queueStatusMessage(data), -1);
           } else if (data.type === "waiting") {
               displayWaitingMessage(data.message, -1);
           }
@@ -54,7 +73,10 @@ window.initPong = function () {
   }
 
   function connectToGame(gameId, role, mode) {
-      gameSocket = new WebSocket(`wss://${host}/ws/game/${gameId}/?player_id=${role}&mode=${mode}`);
+      binaryProtocol = new URLSearchParams(window.location.search).get("proto") === "bin";
+      const proto = binaryProtocol ? "&proto=bin" : "";
+      gameSocket = new WebSocket(`wss://${host}/ws/game/${gameId}/?player_id=${role}&mode=${mode}${proto}`);
+      gameSocket.binaryType = "arraybuffer";
       gameSocket.onopen = () => {
           game_running = true;
           if (role === "local") initializeGameControls(role);
@@ -62,7 +84,7 @@ window.initPong = function () {
       };
 
       gameSocket.onmessage = (event) => {
-          const data = JSON.parse(event.data);
+          const data = event.data instanceof ArrayBuffer ? decodeFrame(event.data) : JSON.parse(event.data);
           handleGameMessage(data, role);
       };
 
@@ -74,21 +96,70 @@ window.initPong = function () {
       gameSocket.onerror = (error) => console.error("Erreur WebSocket (jeu) :", error);
   }
 
+  function decodeFrame(buffer) {
+      const view = new DataView(buffer);
+      const code = view.getUint8(0);
+      const type = FRAME_TYPES[code];
+      const tick = view.getUint32(1, true);
+      const f32 = (offset) => view.getFloat32(offset, true);
+      if (type === "ball_update") {
+          return { type, tick, ball_position: { x: f32(5), y: f32(9), dx: f32(13), dy: f32(17) } };
+      }
+      if (type === "paddle_update") {
+          return { type, tick, player: PLAYERS[view.getUint8(5)], state: { x: f32(6), y: f32(10), dy: f32(14) } };
+      }
+      return {
+          type,
+          tick,
+          ts: view.getFloat64(5, true),
+          rate: view.getUint16(13, true),
+          keyframe: code === 5,
+          ball_position: { x: f32(15), y: f32(19), dx: f32(23), dy: f32(27) },
+          player1_state: { x: f32(31), y: f32(35), dy: f32(39), lifepoints: view.getUint8(43) },
+          player2_state: { x: f32(44), y: f32(48), dy: f32(52), lifepoints: view.getUint8(56) },
+      };
+  }
+
   function handleGameMessage(data, role) {
 
       if (data.type === "position_update") {
+        player1.x = data.player1_state.x;
+        player2.x = data.player2_state.x;
+        player1.hp = data.player1_state.lifepoints;
+        player2.hp = data.player2_state.lifepoints;
+        if (data.keyframe) {
+          syncClock(data.tick, data.rate);
+          snapshots = [];
+          motion.ball = { ...data.ball_position, tick: data.tick };
+          motion.player1 = { y: data.player1_state.y, dy: data.player1_state.dy, tick: data.tick };
+          motion.player2 = { y: data.player2_state.y, dy: data.player2_state.dy, tick: data.tick };
+          startAnimation();
+        } else if (data.tick !== undefined) {
+          pushSnapshot(data);
+        } else {
+          ball.x = data.ball_position.x;
+          ball.y = data.ball_position.y;
+          player1.y = data.player1_state.y;
+          player2.y = data.player2_state.y;
+          updateCanvas();
+        }
+      } else if (data.type === "ball_update") {
+        syncClock(data.tick);
+        motion.ball = { ...data.ball_position, tick: data.tick };
+      } else if (data.type === "paddle_update") {
+        syncClock(data.tick);
+        motion[data.player] = { y: data.state.y, dy: data.state.dy, tick: data.tick };
+      } else if (data.type === "freeze") {
+        stopAnimation();
         ball.x = data.ball_position.x;
         ball.y = data.ball_position.y;
-
-        player1.x = data.player1_state.x;
         player1.y = data.player1_state.y;
         player1.hp = data.player1_state.lifepoints;
-
-        player2.x = data.player2_state.x;
         player2.y = data.player2_state.y;
         player2.hp = data.player2_state.lifepoints;
         updateCanvas();
       } else if (data.type === "game_over") {
+          stopAnimation();
           alert(`Game Over : ${data.message}`);
           game_running = false;
 
@@ -123,10 +194,98 @@ window.initPong = function () {
               navigateTo("/");
           }
       } else if (data.type === "waiting") {
+          stopAnimation();
           displayWaitingMessage(data.message, -1);
       }
   }
 
+  function syncClock(tick, rate) {
+      rate = rate || (clock ? clock.rate : BASE_FPS);
+      clock = { tick: tick, time: performance.now(), rate: rate };
+  }
+
+  function serverTick() {
+      return clock.tick + (performance.now() - clock.time) * clock.rate / 1000;
+  }
+
+  function startAnimation() {
+      if (animationId === null) animationId = requestAnimationFrame(animate);
+  }
+
+  function stopAnimation() {
+      if (animationId !== null) cancelAnimationFrame(animationId);
+      animationId = null;
+      clock = null;
+      snapshots = [];
+      motion.ball = motion.player1 = motion.player2 = null;
+  }
+
+  function animate() {
+      if (!clock || !canvas) {
+          animationId = null;
+          return;
+      }
+      if (snapshots.length) interpolate();
+      else extrapolate();
+      updateCanvas();
+      animationId = requestAnimationFrame(animate);
+  }
+
+  function pushSnapshot(data) {
+      snapshots.push({
+          tick: data.tick,
+          ball: { x: data.ball_position.x, y: data.ball_position.y },
+          player1: data.player1_state.y,
+          player2: data.player2_state.y,
+          hp: data.player1_state.lifepoints + data.player2_state.lifepoints,
+      });
+      if (snapshots.length > 3) snapshots.shift();
+      syncClock(data.tick, data.rate);
+      startAnimation();
+  }
+
+  // Affiche l'état avec un intervalle d'envoi de retard, entre deux snapshots
+  function interpolate() {
+      const last = snapshots[snapshots.length - 1];
+      let from = last, to = last, t = 0;
+      if (snapshots.length > 1) {
+          const delay = last.tick - snapshots[snapshots.length - 2].tick;
+          const renderTick = Math.min(serverTick() - delay, last.tick);
+          for (let i = snapshots.length - 2; i >= 0; --i) {
+              if (snapshots[i].tick <= renderTick) {
+                  from = snapshots[i];
+                  to = snapshots[i + 1];
+                  t = (renderTick - from.tick) / (to.tick - from.tick);
+                  break;
+              }
+          }
+          // Pas d'interpolation à travers une remise au centre
+          if (from.hp !== to.hp) from = to;
+      }
+      const lerp = (a, b) => a + (b - a) * t;
+      ball.x = lerp(from.ball.x, to.ball.x);
+      ball.y = lerp(from.ball.y, to.ball.y);
+      player1.y = lerp(from.player1, to.player1);
+      player2.y = lerp(from.player2, to.player2);
+  }
+
+  function extrapolate() {
+      const tick = serverTick();
+      const scale = BASE_FPS / clock.rate;
+      if (motion.ball) {
+          const elapsed = (tick - motion.ball.tick) * scale;
+          ball.x = motion.ball.x + motion.ball.dx * elapsed;
+          ball.y = Math.min(Math.max(motion.ball.y + motion.ball.dy * elapsed, 0), canvas.height);
+      }
+      [["player1", player1], ["player2", player2]].forEach(([id, player]) => {
+          const paddle = motion[id];
+          if (paddle) {
+              const y = paddle.y + paddle.dy * (tick - paddle.tick) * scale;
+              player.y = Math.min(Math.max(y, 0), canvas.height - PADDLE_HEIGHT);
+          }
+      });
+  }
+
   function initializeGameControls(role = undefined) {
       if (role) {
           document.addEventListener("keydown", localOnKeyDown);
@@ -165,6 +324,7 @@ window.initPong = function () {
   }
 
   window.destroyPong = function () {
+      stopAnimation();
       destroyGameControls();
       destroyLobbySocket();
       destroyGameSocket();
@@ -237,7 +397,11 @@ window.initPong = function () {
 
   function sendAction(action, player = undefined) {
       if (gameSocket && gameSocket.readyState === WebSocket.OPEN) {
-          gameSocket.send(JSON.stringify({ action, player }));
+          if (binaryProtocol) {
+              gameSocket.send(new Uint8Array([ACTION_OPCODES[action] | (PLAYERS.indexOf(player) << 4)]));
+          } else {
+              gameSocket.send(JSON.stringify({ action, player }));
+          }
       } else {
           console.error("WebSocket pour le jeu non ouvert !");
       }
@@ -292,6 +456,15 @@ window.initPong = function () {
   }
 
 
+  function queueStatusMessage(status) {
+      let message = `File d'attente : position ${status.position}`;
+      message += status.window === null ? ", tous niveaux" : `, écart de niveau ±${status.window}`;
+      if (status.eta !== null) {
+          message += `, ~${status.eta} s`;
+      }
+      return message;
+  }
+
   function displayWaitingMessage(message, dots) {
     if (!window.ctx || !window.canvas) {
         console.error("displayWaitingMessage : ctx ou canvas est undefined.");
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import random
+from channels.layers import InMemoryChannelLayer
+from django.test import SimpleTestCase
+from .consumers import ChatConsumer
+from .logic.game import Game
+from .logic.game_loop import GameLoop
+from .logic.ai_player import AIPlayer
+from .logic.constants import CANVAS_WIDTH, CANVAS_HEIGHT, PADDLE_SIZE, PLAYER_SPEED
+from .logic.simulation import HeadlessGame, simulate
+from .logic.vector_physics import VectorPhysics
+from .management.commands.bench_physics import random_game, random_inputs
+
+
+class VectorPhysicsTests(SimpleTestCase):
+    # Mêmes parties, mêmes actions : VectorPhysics doit rester identique à
+    # Game.ball_updater, état relu tous les `compare_every` ticks
+    async def compare(self, count, ticks, compare_every, seed=42):
+        rng = random.Random(seed)
+        reference = [random_game(f"ref{i}", rng) for i in range(count)]
+        rng = random.Random(seed)
+        vector = [random_game(f"vec{i}", rng) for i in range(count)]
+        physics = VectorPhysics()
+        for game in vector:
+            physics.add(game)
+
+        try:
+            for tick in range(ticks):
+                for index, player_id, action in random_inputs(reference, rng):
+                    reference[index].handle_player_action(player_id, action)
+                    vector[index].handle_player_action(player_id, action)
+
+                state = random.getstate()
+                for game in reference:
+                    game.ball_updater()
+                random.setstate(state)
+                for game in vector:
+                    physics.queue(game)
+                physics.flush()
+
+                if tick % compare_every == 0:
+                    for ref, vec in zip(reference, vector):
+                        self.assertEqual(ref.snapshot(), vec.snapshot(), f"partie {ref.game_id}, tick {tick}")
+        finally:
+            # Comptes à rebours lancés par reset_pos
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+    def test_matches_ball_updater_every_tick(self):
+        asyncio.run(self.compare(count=200, ticks=600, compare_every=1))
+
+    def test_matches_ball_updater_with_lazy_sync(self):
+        asyncio.run(self.compare(count=200, ticks=600, compare_every=7))
+
+
+class SimulationTests(SimpleTestCase):
+    # Les contrôleurs de simulate passent par Game.attach_controller : l'IA
+    # déplace sa raquette et bat un joueur immobile sans perdre de point
+    def test_ai_controller_moves_and_wins(self):
+        for seed in range(5):
+            result = simulate(seed, controllers={"player2": AIPlayer("player2")}, max_ticks=20000)
+            self.assertEqual(result["winner"], "player2", f"graine {seed}")
+            self.assertEqual(result["state"][-1], 5, f"graine {seed}")
+
+
+class BroadcastTests(SimpleTestCase):
+    async def receive(self, game, message):
+        game.channel_layer = InMemoryChannelLayer()
+        channel = await game.channel_layer.new_channel()
+        await game.channel_layer.group_add(game.game_id, channel)
+        await game.broadcast(message)
+        return await game.channel_layer.receive(channel)
+
+    # Seuls les encodages attendus par les PongConsumer du groupe sont produits
+    def test_encodes_for_receivers_only(self):
+        game = Game("broadcast", "player1")
+        game.add_receiver(binary=False)
+        event = asyncio.run(self.receive(game, game.position_message()))
+        self.assertEqual(set(event), {"type", "message_type", "text"})
+
+        game.remove_receiver(binary=False)
+        game.add_receiver(binary=True)
+        event = asyncio.run(self.receive(game, game.position_message()))
+        self.assertEqual(set(event), {"type", "message_type", "bytes"})
+
+        # Pas de trame binaire pour game_over : texte pour tous
+        event = asyncio.run(self.receive(game, {"type": "game_over", "message": "player1 lifepoints"}))
+        self.assertEqual(set(event), {"type", "message_type", "text"})
+
+
+class GameLoopTests(SimpleTestCase):
+    async def add(self, loop_rate, tick_rate, send_rate=None):
+        game_loop = GameLoop({}, rate=loop_rate)
+        game = Game("rate", "player1", "player2", tick_rate=tick_rate, send_rate=send_rate or tick_rate)
+        try:
+            game_loop.add(game)
+            return game.tick_every, game.send_every, game.send_rate
+        finally:
+            game_loop.stop()
+
+    # Les fréquences qui divisent celle de la boucle sont tenues, les autres refusées
+    def test_add_honours_or_rejects_tick_rate(self):
+        self.assertEqual(asyncio.run(self.add(120, 40))[0], 3)
+        for tick_rate in (50, 240):
+            with self.assertRaises(ValueError):
+                asyncio.run(self.add(120, tick_rate))
+
+    # Idem pour l'envoi, qui doit tomber sur un nombre entier de ticks
+    def test_add_honours_or_rejects_send_rate(self):
+        self.assertEqual(asyncio.run(self.add(60, 60, send_rate=30)), (1, 2, 30))
+        self.assertEqual(asyncio.run(self.add(60, 60, send_rate=120)), (1, 1, 60))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.add(60, 60, send_rate=25))
+
+
+class SweptCollisionTests(SimpleTestCase):
+    # Service aléatoire, raquettes à vitesse constante : joueur qui perd le
+    # premier point
+    def first_point(self, seed, tick_rate):
+        rng = random.Random(seed)
+        game = HeadlessGame(seed, tick_rate=tick_rate, collision_mode="swept")
+        game.running = True
+        ball = game.ball_state
+        ball.x, ball.y = rng.uniform(100, CANVAS_WIDTH - 100), rng.uniform(10, CANVAS_HEIGHT - 10)
+        ball.dx, ball.dy = rng.choice([-1, 1]) * rng.randint(5, 30), rng.randint(-25, 25)
+        for player in game.players.values():
+            player.y = rng.uniform(0, CANVAS_HEIGHT - PADDLE_SIZE)
+            player.dy = rng.choice([-PLAYER_SPEED, 0, PLAYER_SPEED])
+        for _ in range(tick_rate * 60):
+            game.step()
+            for player_id, player in game.players.items():
+                if player.lifepoints < 5:
+                    return player_id
+        return None
+
+    def test_same_outcome_at_20_and_240_hz(self):
+        for seed in range(300):
+            self.assertEqual(self.first_point(seed, 20), self.first_point(seed, 240), f"graine {seed}")
+
+
+class ChatConsumerTests(SimpleTestCase):
+    # Évènements envoyés aux groupes du chat par les vues d'amis et par la
+    # présence : chacun doit avoir son handler, sans quoi le socket est fermé
+    def test_friend_and_presence_events_are_handled(self):
+        consumer = ChatConsumer()
+        sent = []
+
+        async def send(text_data=None, bytes_data=None, close=False):
+            sent.append(json.loads(text_data))
+
+        consumer.send = send
+        events = [
+            {"type": "user_list", "username": "alice", "action": "added"},
+            {"type": "user_list", "username": "alice", "action": "removed"},
+            {"type": "user_online", "username": "bob"},
+            {"type": "user_offline", "username": "bob"},
+        ]
+
+        async def dispatch():
+            for event in events:
+                await consumer.dispatch(event)
+
+        asyncio.run(dispatch())
+        self.assertEqual([message["type"] for message in sent], [event["type"] for event in events])
+        self.assertEqual(sent[0]["action"], "added")
+        self.assertEqual(sent[2]["username"], "bob")
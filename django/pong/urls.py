@@ -34,8 +34,6 @@ from .views.tournament_views import (
     blockchain_tournaments_view,
 )
 
-INVITATIONS = {}
-
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def protected_view(request):
@@ -58,10 +58,6 @@ def accept_friend_request(request, request_id):
                 "action": "added"
             }
         )
-        async_to_sync(channel_layer.group_send)(
-            "chat_room",
-            {"type": "broadcast_user_list"}
-        )
 
         return Response({"message": "Demande acceptée."}, status=status.HTTP_200_OK)
     return Response({"message": "Aucune demande à accepter trouvée."}, status=status.HTTP_400_BAD_REQUEST)
@@ -109,11 +105,6 @@ def delete_friend(request, username):
         }
     )
 
-    async_to_sync(channel_layer.group_send)(
-        "chat_room",
-        {"type": "broadcast_user_list"}
-    )
-
     return Response({"message": "Ami supprimé."}, status=status.HTTP_200_OK)
 
 